@@ -4,7 +4,7 @@ import io
 import json
 import re
 import tempfile
-from flask import Flask, render_template, request, flash, send_file, redirect, url_for
+from flask import Flask, render_template, request, flash, send_file, redirect, url_for, jsonify
 import google.generativeai as genai
 from docx import Document
 import fitz  # PyMuPDF
@@ -13,6 +13,12 @@ from reportlab.lib.pagesizes import A4, letter
 from reportlab.pdfgen import canvas
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
+from utils.cache import EXTRACTION_CACHE, memoize_text, normalize_text
+from utils.catalog import catalog_resource, get_catalog
+from utils.jd import compile_jd
+from utils.job_store import JobStore
+from utils.scorer import score_against_jobs, score_against_jobs_bm25
+from utils.taxonomy import FUZZY_SKILLS, get_taxonomy
 
 # ---------------- CONFIG ----------------
 load_dotenv()
@@ -27,25 +33,22 @@ else:
     genai = None
 
 GEMINI_MODEL_NAME = "gemini-2.5-flash"
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-JOBS_PATH = os.path.join(BASE_DIR, "jobs.json")
+# most jobs listed in a Gemini match prompt
+GEMINI_MAX_JOBS = 50
+# job catalog (SQLite store when built, else jobs.json) and its index; built
+# here and rebuilt in the background whenever the file changes
+get_catalog()
 
-# load jobs
-if os.path.exists(JOBS_PATH):
-    with open(JOBS_PATH, "r", encoding="utf-8") as f:
-        JOBS_DB = json.load(f)
-else:
-    JOBS_DB = []
-
-# Predefined skill set (fallback local scorer)
-KNOWN_SKILLS = {
-    "python", "java", "c++", "javascript", "html", "css", "sql",
-    "machine learning", "deep learning", "nlp", "data analysis",
-    "excel", "power bi", "tableau", "cloud", "aws", "azure",
-    "flask", "django", "react", "node.js", "git", "docker", "kubernetes"
-}
+# Skill taxonomy (fallback local scorer); compiled once here and swapped in
+# the background whenever skills.json changes
+get_taxonomy()
 
 # ---------------- Helpers ----------------
+def match_jobs_local(resume_text: str, catalog):
+    if catalog.ranking == "bm25":
+        return score_against_jobs_bm25(resume_text, catalog.index)
+    return score_against_jobs(resume_text, catalog.index)
+
 def ask_gemini_json(prompt: str):
     if not genai:
         return None
@@ -68,26 +71,38 @@ def ask_gemini_text(prompt: str):
         app.logger.error("Gemini error (text): %s", e)
         return None
 
-def extract_skills_from_text(text: str):
-    text = (text or "").lower()
-    found = set()
-    for skill in KNOWN_SKILLS:
-        if re.search(rf"\b{re.escape(skill)}\b", text):
-            found.add(skill)
-    return found
+@memoize_text("app.resume_matches")
+def resume_matches(resume_text: str, fuzzy: bool = False):
+    # resumes are resubmitted against many JDs; cached by the resume hash.
+    # the offsets are into resume_text, so pass it through normalize_text
+    # first: texts sharing a cache key must be the same string
+    return get_taxonomy().index_matches(resume_text, fuzzy=fuzzy)
 
 def ats_score_local(resume_text, job_desc):
-    resume_skills = extract_skills_from_text(resume_text)
-    job_skills = extract_skills_from_text(job_desc)
+    taxonomy = get_taxonomy()
+    # one scan gives both the resume skills and where they occur; snippets
+    # are cut from the same normalized text the offsets refer to
+    resume_text = normalize_text(resume_text)
+    resume_index = resume_matches(resume_text, fuzzy=FUZZY_SKILLS)
+    # skills as bitsets over taxonomy ids; the resume side also gets credit
+    # for implied skills ("pytorch" covers "deep learning")
+    resume_mask = taxonomy.expand(sum(1 << i for i in resume_index))
+    # the JD side is compiled once per distinct JD and cached
+    job_mask = compile_jd(job_desc).skill_mask
 
-    matched = resume_skills.intersection(job_skills)
-    missing = job_skills - resume_skills
+    matched = taxonomy.names(job_mask & resume_mask)
+    missing = taxonomy.names(job_mask & ~resume_mask)
 
-    score = int((len(matched) / len(job_skills) * 100)) if job_skills else 0
+    job_count = job_mask.bit_count()
+    score = int(((job_mask & resume_mask).bit_count() / job_count * 100)) if job_count else 0
     return {
         "ats_score": score,
         "matched_skills": sorted(list(matched)),
         "missing_skills": sorted(list(missing)),
+        "skill_snippets": {
+            skill: resume_index.snippet(resume_text, taxonomy.index[skill])
+            for skill in matched if taxonomy.index[skill] in resume_index
+        },
         "suggestions": (
             "Add missing skills to improve your ATS score. "
             f"Missing: {', '.join(sorted(list(missing))) if missing else 'None'}"
@@ -216,8 +231,18 @@ def job_matching():
         if not resume_text:
             flash("Please upload or paste a resume.", "warning")
             return render_template("match.html")
+        # one snapshot for the whole request, even if a reload lands meanwhile
+        catalog = get_catalog()
         if genai:
-            job_list_str = "\n".join([f"- {j.get('title','')}: {', '.join(j.get('keywords', []))}" for j in JOBS_DB])
+            # a large catalog cannot go into a prompt whole; send the
+            # full-text (store) or locally ranked best matches instead
+            if isinstance(catalog.jobs, JobStore):
+                prompt_jobs = [job for _, job in catalog.jobs.search(resume_text, GEMINI_MAX_JOBS)]
+            elif len(catalog.jobs) > GEMINI_MAX_JOBS:
+                prompt_jobs = [catalog.jobs[j] for j, _ in catalog.index.top(resume_text, GEMINI_MAX_JOBS)]
+            else:
+                prompt_jobs = catalog.jobs
+            job_list_str = "\n".join([f"- {j.get('title','')}: {', '.join(j.get('keywords', []))}" for j in prompt_jobs])
             prompt = (
                 "You are a job-matching assistant. Given a resume and job roles, return JSON array of "
                 "{title, score (0-100), matched_skills:[], missing_skills:[]}.\n\n"
@@ -227,12 +252,12 @@ def job_matching():
             try:
                 m = re.search(r"(\[.*\])", gem_text, re.S)
                 parsed = json.loads(m.group(1) if m else gem_text)
-                matches = parsed
+                matches = sorted(parsed, key=lambda x: x.get("score", 0), reverse=True)
             except Exception:
-                matches = []
+                matches = match_jobs_local(resume_text, catalog)
         else:
-            matches = []
-        matches = sorted(matches, key=lambda x: x.get("score", 0), reverse=True)
+            # already the top matches, best first
+            matches = match_jobs_local(resume_text, catalog)
     return render_template("match.html", matches=matches)
 
 # ATS Scoring
@@ -269,5 +294,12 @@ def ats_scoring():
 def healthz():
     return "OK", 200
 
+@app.route("/stats")
+def stats():
+    return jsonify({
+        "extract_cache": EXTRACTION_CACHE.stats(),
+        "job_catalog": dict(catalog_resource().stats(), jobs=len(get_catalog())),
+    })
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), debug=True)
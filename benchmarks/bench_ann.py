@@ -0,0 +1,62 @@
+# benchmarks/bench_ann.py
+"""
+LSH candidate retrieval + exact re-ranking vs exact scoring of every job:
+recall@6 (share of the exact top 6 that the approximate top 6 finds),
+candidates examined and latency for a few table / bit / probe settings,
+next to exact scoring pruned through the inverted index.
+
+Jobs are drawn from role clusters (a core skill set per role plus noise)
+so that near neighbours exist, as they do in real feeds.
+
+Run from the repo root:  python -m benchmarks.bench_ann
+"""
+import random
+import time
+
+from utils.ann import LSHIndex
+from utils.job_index import JobIndex
+
+
+def make_clustered_jobs(n: int, rng: random.Random, n_roles: int = 500, vocab_size: int = 20_000):
+    vocab = [f"skill{i}" for i in range(vocab_size)]
+    roles = [rng.sample(vocab, 30) for _ in range(n_roles)]
+    jobs = []
+    for i in range(n):
+        core = rng.choice(roles)
+        keywords = rng.sample(core, rng.randint(6, 12)) + rng.sample(vocab, rng.randint(0, 4))
+        jobs.append({"title": f"job {i}", "keywords": list(dict.fromkeys(keywords))})
+    return jobs, vocab, roles
+
+
+def main():
+    rng = random.Random(17)
+    n = 300_000
+    jobs, vocab, roles = make_clustered_jobs(n, rng)
+    resumes = [" ".join(rng.sample(rng.choice(roles), 15) + rng.sample(vocab, 20)) for _ in range(100)]
+    index = JobIndex(jobs)
+
+    t0 = time.perf_counter()
+    exact = [[j for j, _ in index.top(r, 6, 0)] for r in resumes]
+    t_exact = (time.perf_counter() - t0) * 1000 / len(resumes)
+    t0 = time.perf_counter()
+    for r in resumes:
+        index.top(r, 6, 1)
+    t_pruned = (time.perf_counter() - t0) * 1000 / len(resumes)
+    print(f"{n} jobs, {len(resumes)} resumes")
+    print(f"exact, every job     {t_exact:8.2f} ms/resume")
+    print(f"exact, pruned        {t_pruned:8.2f} ms/resume")
+    print(f"{'tables':>6} {'bits':>5} {'probes':>6} {'build s':>8} {'candidates':>11} {'ms/resume':>10} {'recall@6':>9}")
+    for n_tables, n_bits, probes in ((16, 8, 0), (32, 8, 0), (32, 10, 4), (64, 10, 4)):
+        t0 = time.perf_counter()
+        lsh = LSHIndex(index, n_tables, n_bits)
+        t_build = time.perf_counter() - t0
+        n_cand = sum(len(lsh.candidates(r, probes)) for r in resumes) / len(resumes)
+        t0 = time.perf_counter()
+        approx = [[j for j, _ in lsh.top(r, 6, probes=probes)] for r in resumes]
+        t_ann = (time.perf_counter() - t0) * 1000 / len(resumes)
+        recall = sum(len(set(a) & set(e)) for a, e in zip(approx, exact)) / sum(map(len, exact))
+        print(f"{n_tables:>6} {n_bits:>5} {probes:>6} {t_build:>8.1f} {n_cand:>11.0f} {t_ann:>10.2f} {recall:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
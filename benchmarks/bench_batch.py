@@ -0,0 +1,49 @@
+# benchmarks/bench_batch.py
+"""
+Throughput of batched skill extraction vs calling the single-document
+extractor in a loop. The process pool is shared across calls, so it is
+warmed up once before timing, as it is in a long-running server.
+
+Run from the repo root:  python -m benchmarks.bench_batch
+"""
+import os
+import random
+import time
+
+from benchmarks.bench_matcher import make_resume
+from utils.batch import extract_skill_ids_batch, extract_skills_batch
+from utils.taxonomy import get_taxonomy
+from utils.tokenizer import tokenized
+
+
+def main():
+    rng = random.Random(11)
+    docs = [make_resume(rng, pages=2) for _ in range(500)]
+    taxonomy = get_taxonomy()
+
+    t0 = time.perf_counter()
+    loop = [taxonomy.extract(d) for d in docs]
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = extract_skills_batch(docs)
+    t_batch = time.perf_counter() - t0
+
+    workers = min(4, os.cpu_count() or 1)
+    extract_skills_batch(docs[:256], processes=workers, chunk_size=64)
+    t0 = time.perf_counter()
+    pooled = extract_skills_batch(docs, processes=workers, chunk_size=64)
+    t_pool = time.perf_counter() - t0
+
+    assert loop == batch == pooled
+    counts = [dict(taxonomy.matcher.count_ids(tokenized(d))) for d in docs]
+    assert counts == extract_skill_ids_batch(docs)
+    n = len(docs)
+    print(f"{n} docs, {sum(map(len, docs))} chars")
+    print(f"loop      {n / t_loop:8.0f} docs/s")
+    print(f"batch     {n / t_batch:8.0f} docs/s")
+    print(f"pool x{workers}   {n / t_pool:8.0f} docs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/bench_bm25.py
+"""
+TF-IDF cosine vs BM25 on a catalog with skewed keyword-list lengths:
+per-resume latency, how much the two rankings overlap, and the average
+length of the top-6 jobs each one picks (cosine favours short lists).
+
+Run from the repo root:  python -m benchmarks.bench_bm25
+"""
+import random
+import time
+
+from utils.bm25 import BM25Index
+from utils.job_index import JobIndex
+
+
+def make_skewed_jobs(n: int, rng: random.Random, vocab_size: int = 5000):
+    vocab = [f"skill{i}" for i in range(vocab_size)]
+    # mostly short lists, a long tail of aggregated postings with 40-120
+    lengths = [rng.randint(3, 12) if rng.random() < 0.8 else rng.randint(40, 120) for _ in range(n)]
+    return [{"title": f"job {i}", "keywords": rng.sample(vocab, k)} for i, k in enumerate(lengths)], vocab
+
+
+def run(name, top, resumes, jobs, exact):
+    top(resumes[0])
+    t0 = time.perf_counter()
+    tops = [[j for j, _ in top(r)] for r in resumes]
+    t_ms = (time.perf_counter() - t0) * 1000 / len(resumes)
+    overlap = sum(len(set(a) & set(b)) / 6 for a, b in zip(tops, exact or tops)) / len(resumes)
+    avg_len = sum(len(jobs[j]["keywords"]) for t in tops for j in t) / sum(map(len, tops))
+    print(f"{name:>22} {t_ms:>9.2f} {overlap:>16.1%} {avg_len:>13.1f}")
+    return tops
+
+
+def main():
+    rng = random.Random(16)
+    jobs, vocab = make_skewed_jobs(50_000, rng)
+    resumes = [" ".join(rng.sample(vocab, 60)) for _ in range(300)]
+    tfidf = JobIndex(jobs)
+    bm25 = BM25Index(jobs)
+    print(f"{len(jobs)} jobs, avg {bm25.avg_len:.1f} keywords, {len(resumes)} resumes")
+    print(f"{'ranking':>22} {'ms/resume':>9} {'overlap w/ tfidf':>16} {'top-6 avg len':>13}")
+    exact = run("tfidf cosine", lambda r: tfidf.top(r, 6), resumes, jobs, None)
+    for k1, b in ((1.2, 0.75), (1.2, 0.3), (2.0, 0.75), (1.2, 1.0)):
+        run(f"bm25 k1={k1} b={b}", lambda r: bm25.top(r, 6, k1, b), resumes, jobs, exact)
+
+
+if __name__ == "__main__":
+    main()
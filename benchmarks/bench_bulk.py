@@ -0,0 +1,48 @@
+# benchmarks/bench_bulk.py
+"""
+Re-scoring a pool of resumes against the whole catalog: one
+score_against_jobs-style call per resume vs the chunked bulk engine, at a
+few memory budgets.
+
+Run from the repo root:  python -m benchmarks.bench_bulk
+"""
+import random
+import time
+import tracemalloc
+
+from benchmarks.bench_job_index import make_jobs
+from utils.bulk import block_shape, score_bulk
+from utils.job_index import JobIndex
+
+
+def main():
+    rng = random.Random(14)
+    jobs, vocab = make_jobs(20_000, rng)
+    index = JobIndex(jobs)
+    resumes = [" ".join(rng.sample(vocab, 80)) + " managed cross-functional teams" for _ in range(2_000)]
+
+    t0 = time.perf_counter()
+    single = [index.top(r, 6, 0) for r in resumes]
+    t_single = time.perf_counter() - t0
+    print(f"{len(resumes)} resumes x {len(jobs)} jobs")
+    print(f"one at a time      {t_single:7.2f} s   {len(resumes) / t_single:8.0f} resumes/s")
+
+    for budget in (4, 32, 128):
+        max_bytes = budget * 1024 * 1024
+        rows, cols = block_shape(len(index), len(index.idf), max_bytes)
+        t0 = time.perf_counter()
+        bulk = [top for _, top in score_bulk(resumes, index, 6, max_bytes)]
+        t_bulk = time.perf_counter() - t0
+        # peak measured on a separate, shorter run (tracing slows everything)
+        tracemalloc.start()
+        for _ in score_bulk(resumes[:rows * 2], index, 6, max_bytes):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert [[j for j, _ in t] for t in bulk] == [[j for j, _ in t] for t in single]
+        print(f"bulk {budget:>4} MB     {t_bulk:7.2f} s   {len(resumes) / t_bulk:8.0f} resumes/s"
+              f"   block {rows}x{cols}, peak {peak / 2**20:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
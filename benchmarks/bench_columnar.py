@@ -0,0 +1,96 @@
+# benchmarks/bench_columnar.py
+"""
+Job catalog start-up in a fresh worker: the whole load_catalog() (jobs plus
+match index) from jobs.json, from the SQLite store, and from the columnar
+catalog with its saved index memory-mapped. Each load runs in its own
+process and reports wall time and memory: RSS, split into private
+(anonymous) memory and file pages, which workers mapping the same files
+share through the page cache. Then checks the top matches agree.
+
+Run from the repo root:  python -m benchmarks.bench_columnar
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.bench_job_index import make_jobs
+from utils.columnar import build_columns
+from utils.job_store import import_jobs
+
+_WORKER = """
+import json, sys, time
+
+def status():
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+from utils.catalog import load_catalog
+before = status()
+t0 = time.perf_counter()
+catalog = load_catalog(sys.argv[1])
+seconds = time.perf_counter() - t0
+after = status()
+tops = [catalog.index.top(text, 6) for text in json.loads(sys.argv[2])]
+print(json.dumps({
+    "seconds": seconds,
+    "rss": after["VmRSS"] - before["VmRSS"],
+    "private": after["RssAnon"] - before["RssAnon"],
+    "shared": after["RssFile"] - before["RssFile"],
+    "kind": type(catalog.jobs).__name__,
+    "tops": tops,
+}))
+"""
+
+
+def load_in_worker(path: str, resumes, env):
+    out = subprocess.run(
+        [sys.executable, "-c", _WORKER, path, json.dumps(resumes)],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    rng = random.Random(25)
+    n = 100_000
+    jobs, vocab = make_jobs(n, rng, vocab_size=30_000)
+    resumes = [" ".join(rng.sample(vocab, 40)) for _ in range(20)]
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "jobs.json")
+        db_path = os.path.join(tmp, "jobs.db")
+        columns_dir = os.path.join(tmp, "job_columns")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(jobs, f)
+        del jobs
+        import_jobs(db_path, [json_path])
+        build_columns([db_path], columns_dir)
+        on_disk = sum(os.path.getsize(os.path.join(columns_dir, f)) for f in os.listdir(columns_dir)) / 2**20
+
+        env = dict(os.environ, PYTHONPATH=os.getcwd(), JOBS_PATH=json_path,
+                   JOB_STORE_PATH=db_path, COLUMNS_PATH=columns_dir)
+        runs = [
+            ("jobs.json + fit", json_path),
+            ("job store + fit", db_path),
+            ("columns + saved index", os.path.join(columns_dir, "meta.json")),
+        ]
+        print(f"{n} jobs, {len(vocab)} distinct keywords; columns and index {on_disk:.1f} MB on disk")
+        results = []
+        for label, path in runs:
+            r = load_in_worker(path, resumes, env)
+            results.append(r)
+            print(f"  {label:22} {r['seconds']:7.2f} s   RSS +{r['rss']:6.0f} MB "
+                  f"(private {r['private']:6.0f} MB, shared file pages {r['shared']:5.0f} MB)   {r['kind']}")
+        assert all(r["tops"] == results[0]["tops"] for r in results)
+        print("top matches identical on 20 resumes")
+
+
+if __name__ == "__main__":
+    main()
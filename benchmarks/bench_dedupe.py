@@ -0,0 +1,77 @@
+# benchmarks/bench_dedupe.py
+"""
+MinHash near-duplicate collapsing: time per job as the feed grows (should
+stay flat, i.e. linear overall), the index's memory per kept job, and
+precision / recall against exact Jaccard similarity of the shingle sets,
+checked over every pair on a small feed.
+
+Run from the repo root:  python -m benchmarks.bench_dedupe
+"""
+import random
+import time
+from itertools import combinations
+
+from benchmarks.bench_job_index import make_jobs
+from utils.dedupe import DuplicateIndex, shingles
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+
+def with_near_duplicates(n: int, rng: random.Random, share: float = 0.2):
+    """
+    n jobs where share of them are copies of an earlier job with one
+    keyword swapped or dropped, in shuffled order.
+    """
+    base, vocab = make_jobs(int(n * (1 - share)), rng, vocab_size=30_000)
+    jobs = list(base)
+    while len(jobs) < n:
+        src = rng.choice(base)
+        keywords = list(src["keywords"])
+        if rng.random() < 0.5:
+            keywords[rng.randrange(len(keywords))] = rng.choice(vocab)
+        else:
+            keywords.pop(rng.randrange(len(keywords)))
+        jobs.append({"title": src["title"], "keywords": keywords})
+    rng.shuffle(jobs)
+    return jobs
+
+
+def main():
+    rng = random.Random(24)
+    threshold = 0.8
+    print(f"threshold {threshold}, bands x rows = {DuplicateIndex(threshold).bands} x {DuplicateIndex(threshold).rows}")
+    for n in (20_000, 80_000, 320_000):
+        jobs = with_near_duplicates(n, rng)
+        index = DuplicateIndex(threshold)
+        t0 = time.perf_counter()
+        kept = dups = 0
+        for start in range(0, n, 2000):
+            k, d = index.collapse(jobs[start:start + 2000], kept)
+            kept += len(k)
+            dups += len(d)
+        elapsed = time.perf_counter() - t0
+        print(f"{n:>7} jobs: {elapsed * 1e6 / n:6.1f} us/job, {dups} collapsed, "
+              f"index {index.nbytes / 2**20:.1f} MB ({index.nbytes / len(index):.0f} B per kept job)")
+
+    # exact all-pairs check on a small feed
+    jobs = with_near_duplicates(3_000, rng)
+    sets = [shingles(job) for job in jobs]
+    truth = {(i, j) for i, j in combinations(range(len(jobs)), 2) if jaccard(sets[i], sets[j]) >= threshold}
+    index = DuplicateIndex(threshold)
+    found = set()
+    for i, signature in enumerate(index.signatures(jobs)):
+        match = index.add(i, signature)
+        if match is not None:
+            found.add((match[0], i))
+    true_dups = {j for _, j in truth}
+    hit = {j for _, j in found}
+    correct = sum(1 for i, j in found if jaccard(sets[i], sets[j]) >= threshold - 0.1)
+    print(f"3000 jobs: {len(true_dups)} have an earlier job >= {threshold} exact Jaccard; "
+          f"recall {len(hit & true_dups) / max(len(true_dups), 1):.1%}, "
+          f"precision (exact >= {threshold - 0.1:.1f}) {correct / max(len(found), 1):.1%}")
+
+
+if __name__ == "__main__":
+    main()
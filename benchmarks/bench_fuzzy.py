@@ -0,0 +1,43 @@
+# benchmarks/bench_fuzzy.py
+"""
+Per-token cost of fuzzy skill lookup against the taxonomy, and the cost of
+a full fuzzy pass over a 10-page resume.
+
+Run from the repo root:  python -m benchmarks.bench_fuzzy
+"""
+import random
+import time
+
+from benchmarks.bench_nlp import make_long_resume
+from utils.taxonomy import get_taxonomy
+
+MISSPELLINGS = ["kubernates", "tensorflw", "postgresq", "javascrpt", "pytorchh",
+                "scikitlearn", "typescrip", "terrafrom", "bootsrtap", "mongodbb"]
+
+
+def main():
+    taxonomy = get_taxonomy()
+    fuzzy = taxonomy.fuzzy
+    rng = random.Random(5)
+    tokens = MISSPELLINGS + ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(7, 12)))
+                             for _ in range(2000)]
+
+    fuzzy._cache.clear()
+    t0 = time.perf_counter()
+    hits = [fuzzy.lookup(t) for t in tokens]
+    per_token = (time.perf_counter() - t0) / len(tokens) * 1e6
+    print(f"cold lookup: {per_token:.1f} us/token over {len(tokens)} tokens")
+    print("misspellings ->", [taxonomy.skills[h] if h is not None else None for h in hits[:len(MISSPELLINGS)]])
+
+    text = make_long_resume(rng)
+    t0 = time.perf_counter()
+    exact = taxonomy.extract(text)
+    t_exact = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    taxonomy.extract(text, fuzzy=True)
+    t_fuzzy = (time.perf_counter() - t0) * 1000
+    print(f"10-page resume: exact {t_exact:.1f} ms, exact+fuzzy {t_fuzzy:.1f} ms ({len(exact)} exact skills)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_hashed.py
+"""
+Fitted-vocabulary JobIndex vs HashedJobIndex: build time, per-resume
+scoring latency, pickled size of the term -> column state (fitted
+vectorizer and vocabulary vs the IDF array) and how closely the hashed
+rankings agree with the fitted ones.
+
+Run from the repo root:  python -m benchmarks.bench_hashed
+"""
+import pickle
+import random
+import time
+
+from benchmarks.bench_job_index import make_jobs
+from utils.job_index import HashedJobIndex, JobIndex
+
+
+def main():
+    rng = random.Random(15)
+    jobs, vocab = make_jobs(50_000, rng, vocab_size=20_000)
+    resumes = [" ".join(rng.sample(vocab, 80)) + " managed cross-functional teams" for _ in range(300)]
+    print(f"{len(jobs)} jobs, {len(vocab)} keywords, {len(resumes)} resumes")
+    print(f"{'mode':>14} {'build ms':>9} {'score ms':>9} {'state MB':>9} {'same top-6':>11} {'top-6 overlap':>14} {'same top-1':>11}")
+    exact = None
+    for name, build in (
+        ("tfidf", lambda: JobIndex(jobs)),
+        ("hashed 2**18", lambda: HashedJobIndex(jobs, 2 ** 18)),
+        ("hashed 2**20", lambda: HashedJobIndex(jobs, 2 ** 20)),
+        ("hashed 2**22", lambda: HashedJobIndex(jobs, 2 ** 22)),
+    ):
+        t0 = time.perf_counter()
+        index = build()
+        t_build = (time.perf_counter() - t0) * 1000
+        # what maps a term to its column and weight (the job matrix itself
+        # is the same size either way)
+        state = (index.vectorizer, index.vocabulary, index.idf, getattr(index, "used", None))
+        size = len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)) / 2**20
+        t0 = time.perf_counter()
+        tops = [[j for j, _ in index.top(r, 6)] for r in resumes]
+        t_score = (time.perf_counter() - t0) * 1000 / len(resumes)
+        if exact is None:
+            exact = tops
+        same6 = sum(a == b for a, b in zip(tops, exact)) / len(resumes)
+        overlap = sum(len(set(a) & set(b)) / 6 for a, b in zip(tops, exact)) / len(resumes)
+        same1 = sum(a[:1] == b[:1] for a, b in zip(tops, exact)) / len(resumes)
+        print(f"{name:>14} {t_build:>9.0f} {t_score:>9.2f} {size:>9.1f} {same6:>11.1%} {overlap:>14.1%} {same1:>11.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_idf.py
+"""
+Corpus IDF table: build once, memory-map per worker, and pairwise TF-IDF
+similarity as transform + dot product vs fitting TfidfVectorizer on every
+resume/JD pair.
+
+Run from the repo root:  python -m benchmarks.bench_idf
+"""
+import random
+import tempfile
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from benchmarks.bench_job_index import make_jobs
+from benchmarks.bench_nlp import make_long_resume
+from utils.idf import IdfModel, cosine, job_text
+from utils.tokenizer import analyze
+
+
+def main():
+    rng = random.Random(19)
+    jobs, vocab = make_jobs(100_000, rng, vocab_size=30_000)
+    resumes = [make_long_resume(rng, 2) for _ in range(300)]
+    jds = [" ".join(rng.sample(vocab, 120)) for _ in range(300)]
+
+    t0 = time.perf_counter()
+    model = IdfModel.from_documents([job_text(j) for j in jobs] + resumes[:100])
+    t_build = time.perf_counter() - t0
+    with tempfile.TemporaryDirectory() as tmp:
+        model.save(tmp)
+        t0 = time.perf_counter()
+        mapped = IdfModel.load(tmp)
+        t_load = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        for r, jd in zip(resumes, jds):
+            vectorizer = TfidfVectorizer(analyzer=analyze).fit([r, jd])
+            vecs = vectorizer.transform([r, jd])
+            cosine_similarity(vecs[0], vecs[1])
+        t_fit = (time.perf_counter() - t0) * 1000 / len(resumes)
+
+        t0 = time.perf_counter()
+        for r, jd in zip(resumes, jds):
+            cosine(mapped.vector(r), mapped.vector(jd))
+        t_corpus = (time.perf_counter() - t0) * 1000 / len(resumes)
+
+    print(f"IDF table: {len(model)} terms from {model.n_docs} documents, "
+          f"{(model.hashes.nbytes + model.idf.nbytes) / 2**20:.1f} MB on disk")
+    print(f"build (offline)          {t_build:8.2f} s")
+    print(f"memory-map (per worker)  {t_load:8.2f} ms")
+    print(f"pair score, fit per pair {t_fit:8.2f} ms")
+    print(f"pair score, corpus IDF   {t_corpus:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/bench_ingest.py
+"""
+Streaming JSONL ingestion (duplicate collapsing off; see bench_dedupe):
+throughput and peak Python heap for a few batch
+sizes (the heap should follow the batch size, not the feed size).
+
+Run from the repo root:  python -m benchmarks.bench_ingest
+"""
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_job_index import make_jobs
+from utils.ingest import ingest_feed
+
+
+def main():
+    rng = random.Random(23)
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = os.path.join(tmp, "feed.jsonl")
+        for n in (50_000, 200_000):
+            jobs, _ = make_jobs(n, rng, vocab_size=30_000)
+            with open(feed, "w", encoding="utf-8") as f:
+                for job in jobs:
+                    f.write(json.dumps(job) + "\n")
+            del jobs
+            size_mb = os.path.getsize(feed) / 2**20
+            for batch in (500, 5_000):
+                db = os.path.join(tmp, f"jobs-{n}-{batch}.db")
+                t0 = time.perf_counter()
+                stats = ingest_feed(feed, db, batch=batch, dedupe=0)
+                elapsed = time.perf_counter() - t0
+                # peak heap on a second, traced run (tracing slows it down)
+                tracemalloc.start()
+                ingest_feed(feed, db + ".traced", batch=batch, dedupe=0)
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+                print(f"{n:>7} jobs ({size_mb:5.1f} MB feed)  batch {batch:>5}: "
+                      f"{stats['ingested'] / elapsed:8.0f} jobs/s   peak heap {peak:6.1f} MB")
+
+if __name__ == "__main__":
+    main()
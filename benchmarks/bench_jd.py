@@ -0,0 +1,70 @@
+# benchmarks/bench_jd.py
+"""
+Scoring 500 resumes against one job description: the old per-call path
+(JD tokens re-extracted and TF-IDF fitted on the resume/JD pair every
+time) vs compiling the JD once and scoring each resume against it.
+
+Run from the repo root:  python -m benchmarks.bench_jd
+"""
+import random
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from benchmarks.bench_nlp import make_long_resume
+from utils.jd import _compile_jd, compile_jd
+from utils.idf import get_idf_model
+from utils.scorer import ats_score_compiled
+from utils.taxonomy import get_taxonomy
+from utils.tokenizer import analyze, is_numeric, tokenized
+
+JD = (
+    "Senior backend engineer. Python, Django and FastAPI services on AWS; Docker and Kubernetes, "
+    "Terraform, CI/CD with GitHub Actions. PostgreSQL, Redis, Kafka. Observability with Prometheus "
+    "and Grafana. Mentoring, code review, agile delivery. "
+) * 8
+
+
+def legacy_pair_score(resume_text, job_desc):
+    resume_lower = resume_text.lower()
+    jd_unique = list(dict.fromkeys(
+        t for t in tokenized(job_desc).tokens if len(t) >= 2 and not is_numeric(t)
+    ))
+    taxonomy = get_taxonomy()
+    implied = taxonomy.implied_skills(taxonomy.extract_doc(tokenized(resume_text)))
+    matched = [k for k in jd_unique if k in resume_lower or taxonomy.canonical(k) in implied]
+    vectorizer = TfidfVectorizer(analyzer=analyze).fit([resume_text, job_desc])
+    vecs = vectorizer.transform([resume_text, job_desc])
+    sim = cosine_similarity(vecs[0], vecs[1])[0][0] * 100
+    return 0.6 * sim + 0.4 * len(matched) / max(1, len(jd_unique)) * 100
+
+
+def main():
+    rng = random.Random(18)
+    resumes = [make_long_resume(rng, 2) for _ in range(500)]
+    get_idf_model()
+
+    t0 = time.perf_counter()
+    for r in resumes:
+        legacy_pair_score(r, JD)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(20):
+        _compile_jd.uncached(JD, get_idf_model().version)
+    t_compile = (time.perf_counter() - t0) * 1000 / 20
+
+    t0 = time.perf_counter()
+    jd = compile_jd(JD)
+    for r in resumes:
+        ats_score_compiled(r, jd)
+    t_compiled = time.perf_counter() - t0
+
+    print(f"{len(resumes)} resumes x 1 JD ({len(JD)} chars, {len(jd.keywords)} keywords)")
+    print(f"per-pair fit (old)        {t_legacy:6.2f} s")
+    print(f"compile once + score      {t_compiled:6.2f} s   (one compile {t_compile:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_job_index.py
+"""
+Scoring one resume against growing catalogs: the old per-request
+fit + per-job transform loop vs a prebuilt JobIndex (one matrix product).
+
+Run from the repo root:  python -m benchmarks.bench_job_index
+"""
+import random
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from utils.job_index import JobIndex
+from utils.scorer import score_against_jobs
+
+
+def make_jobs(n: int, rng: random.Random, vocab_size: int = 3000):
+    vocab = [f"skill{i}" for i in range(vocab_size)]
+    return [{"title": f"job {i}", "keywords": rng.sample(vocab, rng.randint(5, 15))} for i in range(n)], vocab
+
+
+def legacy_scores(resume_text, jobs):
+    job_docs = [" ".join(job.get("keywords", [])) for job in jobs]
+    vectorizer = TfidfVectorizer().fit([resume_text] + job_docs)
+    resume_vec = vectorizer.transform([resume_text])
+    return [cosine_similarity(resume_vec, vectorizer.transform([d]))[0][0] * 100 for d in job_docs]
+
+
+def main():
+    rng = random.Random(13)
+    print(f"{'jobs':>8} {'legacy ms':>10} {'build ms':>9} {'index ms':>9} {'top-6 ms':>9}")
+    for n in (1_000, 10_000, 100_000):
+        jobs, vocab = make_jobs(n, rng)
+        resume = " ".join(rng.sample(vocab, 150)) + " managed cross-functional teams"
+        if n <= 1_000:
+            t0 = time.perf_counter()
+            legacy_scores(resume, jobs)
+            t_legacy = f"{(time.perf_counter() - t0) * 1000:10.0f}"
+        else:
+            t_legacy = f"{'-':>10}"
+        t0 = time.perf_counter()
+        index = JobIndex(jobs)
+        t_build = (time.perf_counter() - t0) * 1000
+        index.scores(resume)
+        t0 = time.perf_counter()
+        for _ in range(10):
+            index.scores(resume)
+        t_score = (time.perf_counter() - t0) * 100
+        # full score_against_jobs: scores, top-k selection, explanations
+        t0 = time.perf_counter()
+        score_against_jobs(resume, index, top_n=6)
+        t_match = (time.perf_counter() - t0) * 1000
+        print(f"{n:>8} {t_legacy} {t_build:>9.0f} {t_score:>9.2f} {t_match:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_job_store.py
+"""
+Job catalog startup: json.load of a big jobs.json per worker vs opening the
+SQLite job store read-only, and the memory a worker holds once the match
+index is built over each (the store is kept by reference and read in
+iter_jobs() batches, the JSON list is kept whole); plus import throughput
+and FTS5 search latency.
+
+Run from the repo root:  python -m benchmarks.bench_job_store
+"""
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_job_index import make_jobs
+from utils.job_index import JobIndex
+from utils.job_store import JobStore, import_jobs
+
+
+def traced_mb(build):
+    """
+    (result, MB still allocated after build(), peak MB during it).
+    """
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 2**20, peak / 2**20
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    rng = random.Random(21)
+    n = 200_000
+    jobs, vocab = make_jobs(n, rng, vocab_size=30_000)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "jobs.json")
+        feed_path = os.path.join(tmp, "feed.jsonl")
+        db_path = os.path.join(tmp, "jobs.db")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(jobs, f)
+        with open(feed_path, "w", encoding="utf-8") as f:
+            for job in jobs:
+                f.write(json.dumps(job) + "\n")
+        del jobs
+
+        t0 = time.perf_counter()
+        import_jobs(db_path, [feed_path])
+        t_import = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with open(json_path, "r", encoding="utf-8") as f:
+            json.load(f)
+        t_json = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        store = JobStore(db_path)
+        t_open = (time.perf_counter() - t0) * 1000
+
+        # memory on separate runs (tracing slows everything down)
+        loaded, json_mb, _ = traced_mb(lambda: load_json(json_path))
+        del loaded
+        _, store_mb, _ = traced_mb(lambda: JobStore(db_path))
+        index, json_index_mb, json_index_peak = traced_mb(lambda: JobIndex(load_json(json_path)))
+        del index
+        index, store_index_mb, store_index_peak = traced_mb(lambda: JobIndex(JobStore(db_path)))
+        assert isinstance(index.jobs, JobStore)
+        del index
+
+        resume = " ".join(rng.sample(vocab, 40))
+        store.search(resume)
+        t0 = time.perf_counter()
+        for _ in range(20):
+            store.search(resume, 50)
+        t_search = (time.perf_counter() - t0) * 1000 / 20
+
+        t0 = time.perf_counter()
+        for i in rng.sample(range(n), 1000):
+            store[i]
+        t_get = (time.perf_counter() - t0) * 1000 / 1000
+
+        print(f"{n} jobs; database {os.path.getsize(db_path) / 2**20:.0f} MB")
+        print(f"import (jsonl feed)    {t_import:8.1f} s   {n / t_import:8.0f} jobs/s")
+        print(f"json.load per worker   {t_json:8.0f} ms  {json_mb:8.0f} MB of Python objects")
+        print(f"JobStore open          {t_open:8.2f} ms  {store_mb:8.2f} MB")
+        print(f"JobIndex over json     {json_index_mb:8.0f} MB held  {json_index_peak:8.0f} MB peak")
+        print(f"JobIndex over store    {store_index_mb:8.0f} MB held  {store_index_peak:8.0f} MB peak")
+        print(f"FTS5 search, top 50    {t_search:8.2f} ms")
+        print(f"job by index           {t_get:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_matcher.py
+"""
+Compare the per-skill regex loop with the single-pass SkillMatcher
+(tokenizing included) as the number of skills grows.
+
+Run from the repo root:  python -m benchmarks.bench_matcher
+"""
+import random
+import re
+import string
+import time
+
+from utils.matcher import SkillMatcher
+from utils.tokenizer import tokenize
+
+REAL_SKILLS = [
+    "python", "java", "c++", "javascript", "html", "css", "sql",
+    "machine learning", "deep learning", "nlp", "data analysis",
+    "excel", "power bi", "tableau", "cloud", "aws", "azure",
+    "flask", "django", "react", "node.js", "git", "docker", "kubernetes"
+]
+
+
+def make_skills(n: int, rng: random.Random):
+    skills = list(REAL_SKILLS)
+    while len(skills) < n:
+        words = rng.randint(1, 3)
+        skills.append(" ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+            for _ in range(words)
+        ))
+    return skills[:n]
+
+
+def make_resume(rng: random.Random, pages: int = 10):
+    filler = ["worked", "on", "team", "project", "delivered", "built", "using",
+              "with", "and", "the", "services", "platform", "data", "users"]
+    words = []
+    for _ in range(pages * 500):
+        words.append(rng.choice(REAL_SKILLS) if rng.random() < 0.05 else rng.choice(filler))
+    return " ".join(words)
+
+
+def regex_loop(skills, text):
+    text = text.lower()
+    found = set()
+    for skill in skills:
+        if re.search(rf"\b{re.escape(skill)}\b", text):
+            found.add(skill)
+    return found
+
+
+def timed(fn, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(7)
+    text = make_resume(rng)
+    print(f"resume: {len(text)} chars")
+    print(f"{'skills':>8} {'regex ms':>10} {'matcher ms':>11} {'build ms':>9}")
+    for n in (25, 250, 1000, 2500, 5000):
+        skills = make_skills(n, rng)
+        t0 = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build = (time.perf_counter() - t0) * 1000
+        t_regex = timed(lambda: regex_loop(skills, text), repeat=1 if n > 1000 else 3)
+        t_match = timed(lambda: matcher.find(tokenize(text)))
+        print(f"{n:>8} {t_regex:>10.2f} {t_match:>11.2f} {build:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
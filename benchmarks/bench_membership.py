@@ -0,0 +1,93 @@
+# benchmarks/bench_membership.py
+"""
+Keyword presence on long resumes: the old substring scan (`k in
+resume_lower`, one pass over the resume per keyword) vs whole-token
+membership in the resume's token / n-gram set.
+
+Before timing, the set lookups are checked against a brute-force
+reference (slide the keyword's tokens along the resume's tokens, gaps must
+be whitespace or a single joiner) on sampled phrases, random words and
+edge cases, so the two can be compared knowing they agree.
+
+Run from the repo root:  python -m benchmarks.bench_membership
+"""
+import random
+import time
+
+from benchmarks.bench_nlp import make_long_resume
+from utils.tokenizer import joins, phrase_key, tokenize, tokenized
+
+EDGE_CASES = [
+    "go", "r", "c", "c++", "c#", ".net", "node.js", "node", "js", "ci/cd", "ci", "scikit-learn",
+    "machine learning", "Machine   Learning", "rest api", "a b c d e", "", "python,", "2019",
+]
+
+
+def reference_has(doc, keyword: str) -> bool:
+    words = tokenize(keyword).tokens
+    n = len(words)
+    if n == 0:
+        return False
+    tokens, gaps = doc.tokens, doc.gaps
+    for i in range(len(tokens) - n + 1):
+        if tuple(tokens[i:i + n]) == words and all(joins(gaps[k]) for k in range(i, i + n - 1)):
+            return True
+    return False
+
+
+def sample_phrases(doc, rng, count):
+    out = []
+    for _ in range(count):
+        i = rng.randrange(len(doc.tokens))
+        n = rng.randint(1, 5)
+        out.append(" ".join(doc.tokens[i:i + n]))
+    return out
+
+
+def check_equivalence(rng):
+    checked = 0
+    for _ in range(20):
+        text = make_long_resume(rng, 2) + " Go, R and C++ (ci/cd); node.js / scikit-learn. Machine learning!"
+        doc = tokenize(text)
+        words = ["".join(rng.choices("abcdefghij", k=rng.randint(1, 4))) for _ in range(200)]
+        for keyword in EDGE_CASES + sample_phrases(doc, rng, 300) + words:
+            assert doc.has_phrase(phrase_key(keyword)) == reference_has(doc, keyword), keyword
+            checked += 1
+    return checked
+
+
+def main():
+    rng = random.Random(20)
+    print(f"equivalence: {check_equivalence(rng)} keyword checks agree with the reference")
+
+    # keywords are keyed once per catalog / compiled JD and the resume is
+    # tokenized once per request anyway, so those are timed separately
+    print(f"{'resume chars':>12} {'keywords':>9} {'substring ms':>13} {'set lookups ms':>15} "
+          f"{'(n-gram set build ms)':>22} {'substring-only hits':>20}")
+    for pages, n_keywords in ((2, 200), (10, 1_000), (40, 5_000)):
+        text = make_long_resume(rng, pages)
+        doc = tokenize(text)
+        keywords = sample_phrases(doc, rng, n_keywords // 2)
+        keywords += ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(1, 6))) for _ in range(n_keywords // 2)]
+
+        t0 = time.perf_counter()
+        lower = text.lower()
+        old = [k in lower for k in keywords]
+        t_old = (time.perf_counter() - t0) * 1000
+
+        phrases = [phrase_key(k) for k in keywords]
+        tokenized.cache_clear()
+        t0 = time.perf_counter()
+        resume_doc = tokenized(text)
+        resume_doc.ngrams
+        t_build = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        new = [resume_doc.has_phrase(p) for p in phrases]
+        t_new = (time.perf_counter() - t0) * 1000
+
+        false_hits = sum(o and not n for o, n in zip(old, new))
+        print(f"{len(text):>12} {len(keywords):>9} {t_old:>13.2f} {t_new:>15.2f} {t_build:>22.2f} {false_hits:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_nlp.py
+"""
+simple_skill_extractor on 10-page resumes: the original list-backed
+implementation vs the set-backed streaming one.
+
+Run from the repo root:  python -m benchmarks.bench_nlp
+"""
+import random
+import re
+
+from benchmarks.bench_matcher import timed
+from utils.nlp import simple_skill_extractor
+from utils.tokenizer import tokenized
+
+# the extractor as it was before the taxonomy/streaming rewrite
+LEGACY_SKILLS = [
+    "python","java","c++","c","javascript","react","angular","nodejs","sql","mysql","postgresql",
+    "mongodb","tensorflow","pytorch","machine learning","deep learning","nlp","computer vision",
+    "pandas","numpy","scikit-learn","aws","azure","docker","kubernetes","git","html","css","bootstrap",
+    "rest","api","flask","django","linux"
+]
+
+
+def legacy_extractor(text, max_keywords=30):
+    text_lower = text.lower()
+    found = []
+    for skill in LEGACY_SKILLS:
+        if skill in text_lower and skill not in found:
+            found.append(skill)
+            if len(found) >= max_keywords:
+                return found
+    tokens = re.findall(r"\b[a-zA-Z0-9\+\#\.\-]{3,}\b", text)
+    for t in tokens:
+        tl = t.lower()
+        if tl not in found and len(found) < max_keywords:
+            if tl in ("the","and","for","with","this","that","from"):
+                continue
+            found.append(tl)
+    return found[:max_keywords]
+
+
+def make_long_resume(rng: random.Random, pages: int = 10):
+    # realistic-ish vocabulary so the unique-token list actually grows
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(4000)]
+    words += ["python", "docker", "kubernetes", "machine learning", "sql", "react", "node.js"]
+    return " ".join(rng.choice(words) for _ in range(pages * 500))
+
+
+def main():
+    rng = random.Random(3)
+    text = make_long_resume(rng)
+    print(f"resume: {len(text)} chars")
+    print(f"{'max_keywords':>12} {'legacy ms':>10} {'streaming ms':>13}")
+    for k in (30, 300, 3000):
+        t_old = timed(lambda: legacy_extractor(text, k), repeat=3)
+        # bypass the result and token caches: measure the extraction itself
+        t_new = timed(lambda: (tokenized.cache_clear(), simple_skill_extractor.uncached(text, k)), repeat=3)
+        print(f"{k:>12} {t_old:>10.2f} {t_new:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# tests/test_app.py
+"""
+The local skill-based ATS score in app.py.
+
+Run from the repo root:  python -m pytest -q
+"""
+import os
+
+# no Gemini calls from tests (load_dotenv keeps an existing value)
+os.environ["GEMINI_API_KEY"] = ""
+
+import app  # noqa: E402
+
+
+def test_snippets_after_line_ending_change():
+    lines = [f"Line {i}: led a team of {i} people on internal tooling." for i in range(60)]
+    lines[45] = "Built services in Python and shipped them with Docker."
+    jd = "Python developer with Docker experience"
+    crlf = app.ats_score_local("\r\n".join(lines), jd)
+    # the same resume with LF endings shares the cached matches
+    lf = app.ats_score_local("\n".join(lines), jd)
+    for result in (crlf, lf):
+        assert result["matched_skills"] == ["docker", "python"]
+        assert "Python and shipped them with Docker" in result["skill_snippets"]["python"]
+        assert "Python and shipped them with Docker" in result["skill_snippets"]["docker"]
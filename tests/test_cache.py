@@ -0,0 +1,40 @@
+# tests/test_cache.py
+"""
+The extraction cache's on-disk tier.
+
+Run from the repo root:  python -m pytest -q
+"""
+import os
+import time
+
+from utils.cache import ResultCache
+
+
+def disk_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def test_disk_tier_stays_under_budget(tmp_path):
+    cache = ResultCache(1 << 20, str(tmp_path), max_disk_bytes=20_000)
+    for i in range(100):
+        cache.put(f"{i:064x}", "x" * 1000)
+    assert disk_bytes(tmp_path) <= 20_000
+    assert cache.stats()["disk_evictions"] > 0
+    # a new worker picks up what is on disk
+    assert ResultCache(1 << 20, str(tmp_path), max_disk_bytes=20_000).stats()["disk_bytes"] == disk_bytes(tmp_path)
+
+
+def test_disk_tier_prunes_least_recently_used(tmp_path):
+    cache = ResultCache(1 << 20, str(tmp_path), max_disk_bytes=12_000)
+    keys = [f"{i:064x}" for i in range(10)]
+    for i, key in enumerate(keys):
+        cache.put(key, "x" * 1000)
+        path = cache._disk_path(key)
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+    # read the oldest back from disk, which makes it the most recent
+    cache.clear()
+    assert cache.get(keys[0]) == (True, "x" * 1000)
+    for i in range(10, 14):
+        cache.put(f"{i:064x}", "x" * 1000)
+    assert os.path.exists(cache._disk_path(keys[0]))
+    assert not os.path.exists(cache._disk_path(keys[1]))
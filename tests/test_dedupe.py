@@ -0,0 +1,52 @@
+# tests/test_dedupe.py
+"""
+Near-duplicate collapsing at ingest.
+
+Run from the repo root:  python -m pytest -q
+"""
+import json
+import sqlite3
+
+from utils.dedupe import DuplicateIndex
+from utils.ingest import ingest_feed
+
+KEYWORDS = ["python", "django", "postgresql", "docker", "redis", "celery", "aws", "git"]
+POSTING = {"title": "Backend Engineer", "keywords": KEYWORDS, "company": "Acme", "location": "Berlin",
+           "url": "https://jobs.example/acme/1"}
+
+
+def test_same_role_at_another_company_is_kept():
+    index = DuplicateIndex(0.8)
+    other = dict(POSTING, company="Globex", location="Munich", url="https://jobs.example/globex/7")
+    kept, duplicates = index.collapse([POSTING, other], 0)
+    assert kept == [POSTING, other]
+    assert duplicates == []
+
+
+def test_collapsed_job_is_stored_whole(tmp_path):
+    repost = dict(POSTING, url="https://board.example/42", salary="70k")
+    feed = tmp_path / "feed.jsonl"
+    feed.write_text("\n".join(json.dumps(job) for job in (POSTING, repost)) + "\n", encoding="utf-8")
+    db_path = str(tmp_path / "jobs.db")
+    stats = ingest_feed(str(feed), db_path, dedupe=0.8)
+    assert (stats["ingested"], stats["duplicates"]) == (1, 1)
+    conn = sqlite3.connect(db_path)
+    try:
+        kept_id, job = conn.execute("SELECT kept_id, job FROM job_duplicates").fetchone()
+    finally:
+        conn.close()
+    assert kept_id == 0
+    assert json.loads(job) == dict(repost, title="Backend Engineer", keywords=KEYWORDS)
+
+
+def test_seed_uses_stored_identity_fields(tmp_path):
+    feed = tmp_path / "feed.jsonl"
+    feed.write_text(json.dumps(POSTING) + "\n", encoding="utf-8")
+    db_path = str(tmp_path / "jobs.db")
+    ingest_feed(str(feed), db_path, dedupe=0.8)
+    # a later feed: the same posting again, and the role at another company
+    later = tmp_path / "later.jsonl"
+    other = dict(POSTING, company="Globex", location="Munich")
+    later.write_text(json.dumps(POSTING) + "\n" + json.dumps(other) + "\n", encoding="utf-8")
+    stats = ingest_feed(str(later), db_path, dedupe=0.8)
+    assert (stats["ingested"], stats["duplicates"]) == (1, 1)
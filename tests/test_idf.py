@@ -0,0 +1,55 @@
+# tests/test_idf.py
+"""
+Corpus IDF weights for pairwise resume vs job description scoring.
+
+Run from the repo root:  python -m pytest -q
+"""
+import json
+
+import numpy as np
+import pytest
+
+from utils.idf import build_idf, cosine
+from utils.scorer import ats_score_local
+
+JD = ("We are looking for a Python engineer with Django and PostgreSQL experience to build and run "
+      "the services behind our product. You will work with the team on the design of the API.")
+FLORIST = ("Florist with eight years of experience running a busy flower shop. I arrange bouquets for "
+           "weddings and the team, and I work with the customers on the design of their orders.")
+SKILLS = "Python, Django, PostgreSQL"
+
+
+@pytest.fixture(scope="module")
+def model():
+    # the shipped catalog plus the resume sample, as the deploy build does
+    return build_idf()
+
+
+def test_skill_terms_outweigh_function_words(model):
+    vector = model.vector(JD)
+    for skill in ("python", "django", "postgresql"):
+        for word in ("we", "are", "for", "and", "the", "with", "our", "you", "to", "of", "on", "behind"):
+            assert vector[skill] > vector.get(word, 0.0), (skill, word)
+
+
+def test_unseen_terms_are_not_weighted_highest(model):
+    assert model.oov_idf < float(np.max(model.idf))
+    assert model.weight("zyxwvut") == model.oov_idf
+
+
+def test_skills_resume_beats_unrelated_prose(model):
+    jd = model.vector(JD)
+    assert cosine(model.vector(SKILLS), jd) > 2 * cosine(model.vector(FLORIST), jd)
+    assert ats_score_local(SKILLS, JD)["ats_score"] > ats_score_local(FLORIST, JD)["ats_score"]
+
+
+def test_job_descriptions_are_counted(tmp_path):
+    feed = tmp_path / "feed.jsonl"
+    jobs = [{"title": "Engineer", "keywords": ["python"], "description": f"Run the on-call rota for team {i}."}
+            for i in range(4)]
+    feed.write_text("\n".join(json.dumps(job) for job in jobs) + "\n", encoding="utf-8")
+    model = build_idf([str(feed)], [])
+    assert model.n_docs == 4
+    # seen in every description: the lowest weight there is
+    assert model.weight("rota") == pytest.approx(1.0)
+    assert model.weight("rota") < model.weight("4")
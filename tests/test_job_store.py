@@ -0,0 +1,25 @@
+# tests/test_job_store.py
+"""
+Bulk import from JSONL feeds.
+
+Run from the repo root:  python -m pytest -q
+"""
+from utils.job_store import JobStore, import_jobs, iter_feed
+
+FEED = '{"title": "a", "keywords": ["python"]}\n{bad\n\n[1]\n{"title": "b", "keywords": ["go"]}\n'
+
+
+def test_iter_feed_skips_bad_lines(tmp_path, caplog):
+    path = tmp_path / "feed.jsonl"
+    path.write_text(FEED, encoding="utf-8")
+    assert [job["title"] for job in iter_feed(str(path))] == ["a", "b"]
+    assert "skipping bad line 2" in caplog.text
+    assert "skipping line 4" in caplog.text
+
+
+def test_import_survives_bad_lines(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    path.write_text(FEED, encoding="utf-8")
+    db_path = str(tmp_path / "jobs.db")
+    import_jobs(db_path, [str(path)])
+    assert [job["keywords"] for job in JobStore(db_path)] == [["python"], ["go"]]
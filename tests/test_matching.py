@@ -0,0 +1,140 @@
+# tests/test_matching.py
+"""
+Matched/missing keywords of score_against_jobs and ats_score_local against
+the original substring implementation, kept here as the reference: the two
+must agree on ordinary text, and differ only where whole-token matching is
+meant to (slash, hyphen and newline forms, "java" inside "javascript").
+
+Run from the repo root:  python -m pytest -q
+"""
+import re
+
+import pytest
+
+from utils.scorer import ats_score_local, score_against_jobs
+
+JOBS = [
+    {"title": "Backend", "keywords": ["Python", "Django", "REST API", "PostgreSQL", "Docker"]},
+    {"title": "Frontend", "keywords": ["JavaScript", "React", "Node.js", "CSS", "CI/CD"]},
+    {"title": "ML Engineer", "keywords": ["Machine Learning", "scikit-learn", "PyTorch", "Python"]},
+    {"title": "Java Developer", "keywords": ["Java", "Spring", "SQL"]},
+]
+
+
+def old_job_presence(resume_text: str, keywords):
+    """
+    matched, missing of the original score_against_jobs: a keyword is
+    present when it is a substring of the lowercased resume.
+    """
+    resume_lower = (resume_text or "").lower()
+    matched = [k for k in keywords if k.lower() in resume_lower]
+    missing = [k for k in keywords if k.lower() not in resume_lower]
+    return matched, missing
+
+
+def old_ats_presence(resume_text: str, job_desc: str):
+    """
+    matched, missing of the original ats_score_local.
+    """
+    resume_lower = (resume_text or "").lower()
+    jd_unique = list(dict.fromkeys(re.findall(r"[a-zA-Z\+\#\.\-]{2,}", job_desc.lower())))
+    matched = [k for k in jd_unique if k in resume_lower]
+    missing = [k for k in jd_unique if k not in resume_lower]
+    return matched, missing
+
+
+def job_presence(resume_text: str):
+    """
+    {title: (matched, missing)} of every job score_against_jobs returns.
+    """
+    return {r["title"]: (r["matched"], r["missing"]) for r in score_against_jobs(resume_text, JOBS, top_n=len(JOBS))}
+
+
+# resumes on which old and new agree for every job returned
+@pytest.mark.parametrize("resume_text", [
+    "Python developer: Django, PostgreSQL and Docker. REST API design.",
+    "Styled pages with CSS, shipped through CI/CD pipelines.",
+    "Machine Learning with scikit-learn and PyTorch in Python.",
+    "Spring and SQL services in Java.",
+    "Python\nDjango\nDocker",
+])
+def test_score_against_jobs_agrees_with_old(resume_text):
+    results = job_presence(resume_text)
+    assert results
+    keywords = {job["title"]: job["keywords"] for job in JOBS}
+    for title, presence in results.items():
+        assert presence == old_job_presence(resume_text, keywords[title]), title
+
+
+def test_score_against_jobs_slash_forms():
+    results = job_presence("Built UIs in React/Node.js with CI/CD pipelines and CSS.")
+    # javascript is implied by react
+    assert results["Frontend"] == (["JavaScript", "React", "Node.js", "CSS", "CI/CD"], [])
+
+
+def test_score_against_jobs_hyphen_forms():
+    resume_text = "Applied machine-learning with scikit-learn and PyTorch in Python."
+    assert job_presence(resume_text)["ML Engineer"] == (["Machine Learning", "scikit-learn", "PyTorch", "Python"], [])
+    # the old substring test missed "machine learning" written with a hyphen
+    assert old_job_presence(resume_text, JOBS[2]["keywords"])[1] == ["Machine Learning"]
+
+
+def test_score_against_jobs_newline_forms():
+    resume_text = "Research in Machine\nLearning using PyTorch"
+    assert job_presence(resume_text)["ML Engineer"] == (["Machine Learning", "PyTorch", "Python"], ["scikit-learn"])
+
+
+def test_score_against_jobs_whole_tokens_only():
+    # "java" inside "javascript" is not java
+    results = job_presence("Frontend work in JavaScript and TypeScript")
+    assert results["Frontend"][0] == ["JavaScript"]
+    assert "Java" not in results.get("Java Developer", ([], []))[0]
+    assert "Java" in old_job_presence("Frontend work in JavaScript and TypeScript", ["Java"])[0]
+
+
+def ats_presence(resume_text: str, job_desc: str):
+    result = ats_score_local(resume_text, job_desc)
+    return result["matched_keywords"], result["missing_keywords"]
+
+
+# (resume, job description) pairs on which old and new agree
+@pytest.mark.parametrize("resume_text, job_desc", [
+    ("python and docker", "Python, Django, Docker, Kubernetes"),
+    ("machine-learning engineer", "Machine learning engineer"),
+    ("Deep\nLearning and Python", "deep learning python"),
+    ("Pipelines in scikit-learn and pandas", "scikit-learn, pandas, numpy"),
+    ("Shipped React and Node.js apps", "React/Node.js developer"),
+    ("Owned CI/CD with Jenkins", "CI/CD, Jenkins, Terraform"),
+    ("Kubernetes\nterraform", "Terraform\nKubernetes\nHelm"),
+])
+def test_ats_score_local_agrees_with_old(resume_text, job_desc):
+    assert ats_presence(resume_text, job_desc) == old_ats_presence(resume_text, job_desc)
+
+
+def test_ats_score_local_slash_forms():
+    matched, missing = ats_presence("Experience with React/Node.js and CI/CD",
+                                    "React/Node.js, CI/CD experience")
+    assert matched == ["react", "node.js", "ci", "cd", "experience"]
+    assert missing == []
+
+
+def test_ats_score_local_hyphen_forms():
+    # compound JD terms stay whole and match however the resume joins them
+    matched, missing = ats_presence("Applied machine learning with scikit learn",
+                                    "machine-learning, scikit-learn, Node.js")
+    assert matched == ["machine-learning", "scikit-learn"]
+    assert missing == ["node.js"]
+
+
+def test_ats_score_local_newline_forms():
+    matched, missing = ats_presence("Natural Language\nProcessing, Python", "natural language processing\npython\ngo")
+    assert matched == ["natural", "language", "processing", "python"]
+    assert missing == ["go"]
+
+
+def test_ats_score_local_whole_tokens_only():
+    # "go" inside "google" and "java" inside "javascript" are not matches
+    matched, missing = ats_presence("Google Cloud and JavaScript", "Go, Java, cloud")
+    assert matched == ["cloud"]
+    assert missing == ["go", "java"]
+    assert old_ats_presence("Google Cloud and JavaScript", "Go, Java, cloud")[1] == []
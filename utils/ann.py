@@ -0,0 +1,133 @@
+# utils/ann.py
+"""
+Approximate nearest-neighbour job retrieval with random-projection LSH.
+
+Each job's TF-IDF vector is reduced to n_tables signatures of n_bits sign
+bits (random hyperplanes, so two vectors agree on a bit with probability
+1 - angle / pi). A resume only looks at the jobs sharing a signature in
+some table, plus the buckets one bit-flip away for its least certain bits
+(probes), and those candidates are re-ranked exactly. More tables or
+probes raise recall, more bits shrink the buckets.
+"""
+import os
+
+import numpy as np
+from scipy import sparse
+
+from utils.job_index import top_k
+from utils.tokenizer import analyze
+
+ANN_TABLES = int(os.environ.get("ANN_TABLES", "32"))
+ANN_BITS = int(os.environ.get("ANN_BITS", "10"))
+ANN_PROBES = int(os.environ.get("ANN_PROBES", "4"))
+_CHUNK_ROWS = 65536
+
+
+class LSHIndex:
+    """
+    Wraps a JobIndex (or HashedJobIndex); jobs and job_keywords are the
+    wrapped index's, so score_against_jobs accepts it directly.
+
+    planes: float32 (n_used_columns x n_tables * n_bits) hyperplanes, only
+        for the columns some job uses (other columns cannot move a resume
+        towards or away from any job)
+    codes/order: per table, the job signatures sorted ascending and the job
+        ids in that order, so a bucket is one searchsorted range
+    """
+
+    def __init__(self, index, n_tables: int = ANN_TABLES, n_bits: int = ANN_BITS, seed: int = 0):
+        if not 1 <= n_bits <= 62:
+            raise ValueError("n_bits must be between 1 and 62")
+        self.index = index
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        matrix = index.matrix
+        if matrix is None:
+            self.columns = np.zeros(0, dtype=np.int64)
+            self.planes = np.zeros((0, n_tables * n_bits), dtype=np.float32)
+            self.codes = [np.zeros(0, dtype=np.int64)] * n_tables
+            self.order = [np.zeros(0, dtype=np.int64)] * n_tables
+            return
+        self.columns = np.unique(matrix.indices).astype(np.int64)
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((len(self.columns), n_tables * n_bits), dtype=np.float32)
+        # job rows with their columns renumbered to rows of planes
+        compact = sparse.csr_matrix(
+            (matrix.data, np.searchsorted(self.columns, matrix.indices), matrix.indptr),
+            shape=(matrix.shape[0], len(self.columns)),
+        )
+        codes = np.empty((matrix.shape[0], n_tables), dtype=np.int64)
+        for start in range(0, matrix.shape[0], _CHUNK_ROWS):
+            projected = compact[start:start + _CHUNK_ROWS] @ self.planes
+            codes[start:start + _CHUNK_ROWS] = self._pack(projected > 0)
+        self.order = [np.argsort(codes[:, t], kind="stable") for t in range(n_tables)]
+        self.codes = [codes[self.order[t], t] for t in range(n_tables)]
+
+    @property
+    def jobs(self):
+        return self.index.jobs
+
+    @property
+    def job_keywords(self):
+        return self.index.job_keywords
+
+    def __len__(self):
+        return len(self.index)
+
+    def _pack(self, bits):
+        """
+        (rows x n_tables * n_bits) booleans -> (rows x n_tables) int64 codes.
+        """
+        weights = np.left_shift(1, np.arange(self.n_bits, dtype=np.int64))
+        return bits.reshape(bits.shape[0], self.n_tables, self.n_bits) @ weights
+
+    def _project(self, text: str):
+        """
+        The resume's projections (n_tables x n_bits), or None if it shares
+        no column with any job.
+        """
+        weights, _ = self.index.term_weights(analyze(text or ""))
+        if not weights:
+            return None
+        cols = np.fromiter(weights, dtype=np.int64, count=len(weights))
+        rows = np.searchsorted(self.columns, cols)
+        w = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+        return (w @ self.planes[rows]).reshape(self.n_tables, self.n_bits)
+
+    def candidates(self, text: str, probes: int = ANN_PROBES):
+        """
+        Ascending ids of the jobs sharing a bucket with text in any table,
+        also probing the probes buckets reached by flipping one of its
+        lowest-margin bits.
+        """
+        projected = self._project(text)
+        if projected is None:
+            return np.zeros(0, dtype=np.int64)
+        weights = np.left_shift(1, np.arange(self.n_bits, dtype=np.int64))
+        base = (projected > 0) @ weights
+        probes = min(probes, self.n_bits)
+        flips = np.argsort(np.abs(projected), axis=1)[:, :probes]
+        found = []
+        for t in range(self.n_tables):
+            codes, order = self.codes[t], self.order[t]
+            for code in [base[t]] + [base[t] ^ weights[f] for f in flips[t].tolist()]:
+                lo, hi = np.searchsorted(codes, [code, code + 1])
+                if hi > lo:
+                    found.append(order[lo:hi])
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def top(self, text: str, k: int, min_overlap: int = 1, probes: int = ANN_PROBES):
+        """
+        [(job_id, score)] for the best k of the LSH candidates, re-ranked by
+        exact cosine (0-100). Jobs LSH misses are never returned, so there
+        can be fewer than k results; min_overlap is accepted for
+        score_against_jobs and ignored.
+        """
+        candidates = self.candidates(text, probes)
+        if candidates.size == 0:
+            return []
+        q = self.index.query_vector(text)
+        scores = (self.index.matrix[candidates] @ q) * 100
+        return [(int(candidates[i]), float(scores[i])) for i in top_k(scores, k).tolist() if scores[i] > 0]
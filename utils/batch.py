@@ -0,0 +1,223 @@
+# utils/batch.py
+"""
+Batched skill extraction for many documents at once (e.g. every resume
+submitted against one job description).
+
+A chunk of documents is tokenized in one pass into flat token and gap
+lists (no character offsets, which only single-document callers need), the
+tokens are mapped to phrase-token ids in C, and skills are found for the
+whole chunk with array operations over those ids: one-token skills by
+lookup, longer phrases by stepping a token-id trie only where a phrase can
+start. Same hits as SkillMatcher.count_ids on each document.
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from utils.taxonomy import get_taxonomy
+from utils.tokenizer import _TOKEN_AND_GAP, joins, lower_aligned
+
+_tables_cache = None
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class _PhraseTables:
+    """
+    The matcher's phrase table over integer token ids:
+    token_ids: {token: id} for every token of every phrase
+    single: skill id of each one-token phrase by token id, else -1
+    root: trie node reached from the root by each token id, else -1
+    codes / children: sorted node * n_tokens + token id -> child node
+    skill_of: skill id of the phrase ending at each node, else -1
+    """
+
+    def __init__(self, matcher):
+        token_ids = {}
+        for phrase in matcher.phrases:
+            for token in phrase.split(" "):
+                token_ids.setdefault(token, len(token_ids))
+        n = len(token_ids)
+        self.token_ids = token_ids
+        self.n_tokens = n
+        self.single = np.full(n + 1, -1, dtype=np.int64)
+        self.root = np.full(n + 1, -1, dtype=np.int64)
+        transitions = {}
+        skill_of = [-1]
+        for phrase, skill_id in matcher.phrases.items():
+            ids = [token_ids[t] for t in phrase.split(" ")]
+            if len(ids) == 1:
+                self.single[ids[0]] = skill_id
+                continue
+            node = self.root[ids[0]]
+            if node < 0:
+                node = self.root[ids[0]] = len(skill_of)
+                skill_of.append(-1)
+            for token_id in ids[1:]:
+                key = int(node) * n + token_id
+                child = transitions.get(key)
+                if child is None:
+                    child = transitions[key] = len(skill_of)
+                    skill_of.append(-1)
+                node = child
+            skill_of[node] = skill_id
+        codes = sorted(transitions)
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.children = np.asarray([transitions[c] for c in codes], dtype=np.int64)
+        self.skill_of = np.asarray(skill_of, dtype=np.int64)
+
+    def step(self, nodes, token_ids):
+        """
+        Child node for each (node, token id), -1 where there is none.
+        """
+        out = np.full(len(nodes), -1, dtype=np.int64)
+        if not len(self.codes):
+            return out
+        codes = nodes * self.n_tokens + token_ids
+        at = np.minimum(np.searchsorted(self.codes, codes), len(self.codes) - 1)
+        found = self.codes[at] == codes
+        out[found] = self.children[at[found]]
+        return out
+
+
+def _tables(taxonomy):
+    global _tables_cache
+    cached = _tables_cache
+    if cached is None or cached[0] is not taxonomy.matcher:
+        cached = _tables_cache = (taxonomy.matcher, _PhraseTables(taxonomy.matcher))
+    return cached[1]
+
+
+def _scan_ids(docs, taxonomy=None):
+    """
+    Returns a list of {skill_id: count} dicts, one per document.
+    """
+    if taxonomy is None:
+        taxonomy = get_taxonomy()
+    tables = _tables(taxonomy)
+    tokens, gaps, sizes = [], [], []
+    for doc in docs:
+        pairs = _TOKEN_AND_GAP.findall(lower_aligned(doc))
+        sizes.append(len(pairs))
+        if pairs:
+            doc_tokens, doc_gaps = zip(*pairs)
+            tokens.extend(doc_tokens)
+            gaps.extend(doc_gaps)
+            # the last token of a document never joins the next document
+            gaps[-1] = "\0"
+    out = [{} for _ in docs]
+    if not tokens:
+        return out
+    # phrase-token id of every token (n_tokens = not part of any skill)
+    n = tables.n_tokens
+    ids = np.fromiter(map(tables.token_ids.get, tokens, repeat(n)), dtype=np.int64, count=len(tokens))
+    doc_of = np.repeat(np.arange(len(docs)), sizes)
+    hit_docs, hit_skills = [], []
+    # one-token skills
+    single = tables.single[ids]
+    at = np.flatnonzero(single >= 0)
+    hit_docs.append(doc_of[at])
+    hit_skills.append(single[at])
+    # longer phrases: walk the trie from every token that can start one
+    starts = np.flatnonzero(tables.root[ids] >= 0)
+    nodes = tables.root[ids[starts]]
+    last = starts
+    while len(starts):
+        nxt = last + 1
+        keep = nxt < len(ids)
+        starts, nodes, last, nxt = starts[keep], nodes[keep], last[keep], nxt[keep]
+        keep = ids[nxt] < n
+        starts, nodes, last, nxt = starts[keep], nodes[keep], last[keep], nxt[keep]
+        joined = np.fromiter((joins(gaps[i]) for i in last.tolist()), dtype=bool, count=len(last))
+        starts, nodes, nxt = starts[joined], nodes[joined], nxt[joined]
+        nodes = tables.step(nodes, ids[nxt])
+        keep = nodes >= 0
+        starts, nodes, last = starts[keep], nodes[keep], nxt[keep]
+        skills = tables.skill_of[nodes]
+        found = skills >= 0
+        hit_docs.append(doc_of[starts[found]])
+        hit_skills.append(skills[found])
+    hit_docs = np.concatenate(hit_docs)
+    hit_skills = np.concatenate(hit_skills)
+    n_skills = len(taxonomy.skills)
+    keys, counts = np.unique(hit_docs * n_skills + hit_skills, return_counts=True)
+    for key, count in zip(keys.tolist(), counts.tolist()):
+        out[key // n_skills][key % n_skills] = count
+    return out
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _process_pool(processes: int):
+    """
+    One process pool reused across calls, so workers (and the taxonomy each
+    has loaded) outlive a batch; replaced if a different size is asked for.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._max_workers != processes:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=processes)
+        return _pool
+
+
+def extract_skill_ids_batch(docs, processes: int = 0, chunk_size: int = 256, taxonomy=None):
+    """
+    Skill-id counts for every document, in input order.
+    With processes > 0 the batch is split into chunks and scanned in a
+    shared process pool; each worker uses its own copy of the compiled
+    taxonomy (loaded from the same skills.json), so nothing is pickled but
+    text.
+    """
+    if taxonomy is None:
+        taxonomy = get_taxonomy()
+    docs = [d or "" for d in docs]
+    if processes and len(docs) > chunk_size:
+        out = []
+        for part in _process_pool(processes).map(_scan_ids, _chunks(docs, chunk_size)):
+            out.extend(part)
+        return out
+    out = []
+    for chunk in _chunks(docs, chunk_size):
+        out.extend(_scan_ids(chunk, taxonomy))
+    return out
+
+
+def extract_skills_batch(docs, processes: int = 0, chunk_size: int = 256):
+    """
+    Batch counterpart of extract_skills_from_text: one set of canonical
+    skills per input document.
+    """
+    taxonomy = get_taxonomy()
+    skills = taxonomy.skills
+    return [
+        {skills[i] for i in row}
+        for row in extract_skill_ids_batch(docs, processes, chunk_size, taxonomy)
+    ]
+
+
+def skill_matrix(docs, processes: int = 0, chunk_size: int = 256):
+    """
+    Sparse document x skill count matrix (scipy CSR), columns indexed by
+    skill id. Returns (matrix, skills) so columns can be labelled.
+    """
+    from scipy.sparse import csr_matrix
+
+    taxonomy = get_taxonomy()
+    skills = taxonomy.skills
+    indptr = [0]
+    indices = []
+    data = []
+    for row in extract_skill_ids_batch(docs, processes, chunk_size, taxonomy):
+        for skill_id in sorted(row):
+            indices.append(skill_id)
+            data.append(row[skill_id])
+        indptr.append(len(indices))
+    matrix = csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(skills)), dtype="int32")
+    return matrix, skills
@@ -0,0 +1,101 @@
+# utils/bm25.py
+"""
+BM25 ranking of jobs against a resume.
+
+Term frequencies live in the inverted index postings and job lengths, IDF
+and the average length in float32 arrays, so k1 and b can be chosen per
+query: scoring gathers the postings of the resume's terms and applies the
+BM25 formula to all of them at once.
+"""
+import os
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from utils.inverted_index import InvertedIndex, sum_by_job
+from utils.job_index import catalog_jobs, job_document, top_k
+from utils.tokenizer import analyze, analyze_uncached
+from utils.vocab import JobKeywords, Vocabulary
+
+BM25_K1 = float(os.environ.get("BM25_K1", "1.2"))
+BM25_B = float(os.environ.get("BM25_B", "0.75"))
+
+
+class BM25Index:
+    """
+    jobs: the job dicts in index order (a ColumnarJobs or JobStore is kept
+    as it is, see catalog_jobs)
+    vocab: Vocabulary of the job document terms
+    inverted: InvertedIndex whose posting weights are raw term frequencies
+    doc_len: float32 number of terms in each job document
+    idf: float32 BM25 idf per term, log(1 + (N - df + 0.5) / (df + 0.5))
+    job_keywords: JobKeywords for matched/missing explanations
+    """
+
+    def __init__(self, jobs):
+        self.jobs = catalog_jobs(jobs)
+        self.job_keywords = JobKeywords(self.jobs)
+        self.vocab = Vocabulary()
+        indptr, indices, tfs = [0], [], []
+        for job in self.jobs:
+            counts = Counter(self.vocab.add(t) for t in analyze_uncached(job_document(job)))
+            indices.extend(counts)
+            tfs.extend(counts.values())
+            indptr.append(len(indices))
+        n_jobs = len(self.jobs)
+        tf = sparse.csr_matrix(
+            (np.asarray(tfs, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(n_jobs, len(self.vocab)),
+        )
+        self.inverted = InvertedIndex.from_matrix(tf)
+        self.doc_len = np.asarray(tf.sum(axis=1), dtype=np.float32).ravel()
+        self.avg_len = float(self.doc_len.mean()) if n_jobs else 0.0
+        df = np.diff(self.inverted.indptr).astype(np.float32)
+        self.idf = np.log1p((n_jobs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def query_terms(self, text: str):
+        """
+        Distinct vocabulary term ids of text; a term repeated in a resume
+        does not count more than once.
+        """
+        vocab = self.vocab
+        ids = {vocab.get(t) for t in analyze(text or "")}
+        ids.discard(None)
+        return np.fromiter(sorted(ids), dtype=np.int64, count=len(ids))
+
+    def candidate_scores(self, text: str, k1: float = BM25_K1, b: float = BM25_B, min_overlap: int = 1):
+        """
+        (job_ids, scores) for the jobs sharing at least min_overlap terms
+        with text. Scores are BM25 as a percentage of the best any job could
+        reach for this query (every term present, saturated).
+        """
+        terms = self.query_terms(text)
+        if terms.size == 0:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        which, hits, tf = self.inverted.gather(terms)
+        idf = self.idf[terms]
+        norm = k1 * (1 - b + b * self.doc_len[hits] / self.avg_len)
+        values = idf[which] * tf * (k1 + 1) / (tf + norm)
+        jobs, scores = sum_by_job(hits, values, min_overlap)
+        ceiling = float(idf.sum()) * (k1 + 1)
+        return jobs, scores * (100 / ceiling if ceiling > 0 else 0)
+
+    def top(self, text: str, k: int, k1: float = BM25_K1, b: float = BM25_B, min_overlap: int = 1):
+        """
+        [(job_id, score)] for the k best jobs by BM25, best first; with
+        fewer than k candidates the rest follow at 0 in job order.
+        """
+        candidates, scores = self.candidate_scores(text, k1, b, min_overlap)
+        picked = [(int(candidates[i]), float(scores[i])) for i in top_k(scores, k).tolist()]
+        if min_overlap == 1 and len(picked) < k:
+            taken = {j for j, _ in picked}
+            for j in range(len(self.jobs)):
+                if len(picked) >= k:
+                    break
+                if j not in taken:
+                    picked.append((j, 0.0))
+        return picked
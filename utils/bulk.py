@@ -0,0 +1,110 @@
+# utils/bulk.py
+"""
+Bulk resumes x jobs scoring.
+
+Resumes are pulled from any iterable in chunks, vectorized into one sparse
+matrix per chunk and multiplied against the job matrix a block of jobs at a
+time, so the dense score block never exceeds BULK_MAX_BYTES however many
+resumes (or jobs) there are. Results are yielded per resume as they are
+ready.
+"""
+import math
+import os
+from itertools import islice
+
+import numpy as np
+from scipy import sparse
+
+from utils.job_index import top_k
+from utils.tokenizer import analyze_uncached
+
+BULK_MAX_BYTES = int(os.environ.get("BULK_MAX_BYTES", str(64 * 1024 * 1024)))
+_SCORE_BYTES = np.dtype(np.float32).itemsize
+
+
+def query_matrix(index, texts):
+    """
+    CSR float32 (len(texts) x n_columns) of the texts' TF-IDF vectors over
+    the job columns, normalized exactly like JobIndex.query_vector (terms no
+    job uses count towards the norm).
+    """
+    indptr, indices, data = [0], [], []
+    for text in texts:
+        weights, sq = index.term_weights(analyze_uncached(text))
+        if weights:
+            norm = math.sqrt(sq)
+            indices.extend(weights)
+            data.extend(w / norm for w in weights.values())
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(index.idf)),
+    )
+
+
+def block_shape(n_jobs: int, n_terms: int, max_bytes: int = BULK_MAX_BYTES):
+    """
+    (resume rows, job columns) of the largest chunk whose dense float32
+    query rows and score block fit in max_bytes together.
+    """
+    cols = max(1, min(n_jobs, max_bytes // _SCORE_BYTES - n_terms))
+    rows = max(1, max_bytes // (_SCORE_BYTES * (cols + n_terms)))
+    return rows, cols
+
+
+def _row_top(blocks, k: int):
+    """
+    Merge per-block (job_ids, scores) candidates into the row's top k with
+    the same order (and tie-breaking) as top_k over all jobs.
+    """
+    if len(blocks) == 1:
+        job_ids, scores = blocks[0]
+    else:
+        job_ids = np.concatenate([b[0] for b in blocks])
+        scores = np.concatenate([b[1] for b in blocks])
+        # candidates back in job order, so ties still favour the earlier job
+        order = np.argsort(job_ids, kind="stable")
+        job_ids, scores = job_ids[order], scores[order]
+    best = top_k(scores, k)
+    return [(int(j), float(s)) for j, s in zip(job_ids[best].tolist(), scores[best].tolist())]
+
+
+def score_bulk(resume_texts, index, top_n: int = 6, max_bytes: int = BULK_MAX_BYTES):
+    """
+    Yield (position, [(job_id, score), ...]) for every resume in
+    resume_texts (any iterable, consumed lazily), with the same top_n and
+    scores (0-100) score_against_jobs(..., min_overlap=0) gives one at a
+    time. Peak extra memory is about max_bytes plus one chunk of resumes.
+    """
+    n_jobs = len(index)
+    texts = iter(resume_texts)
+    rows, cols = block_shape(n_jobs, len(index.idf), max_bytes)
+    position = 0
+    if index.matrix is None:
+        # nothing to match against; every job scores 0, in job order
+        empty = [(j, 0.0) for j in range(min(top_n, n_jobs))]
+        for _ in texts:
+            yield position, list(empty)
+            position += 1
+        return
+    while True:
+        chunk = list(islice(texts, rows))
+        if not chunk:
+            break
+        # dense query rows: sparse jobs @ dense queries is the fast product
+        q_t = query_matrix(index, chunk).toarray().T
+        candidates = [[] for _ in chunk]
+        for start in range(0, n_jobs, cols):
+            stop = min(n_jobs, start + cols)
+            # (jobs x resumes), from a cheap CSR row slice
+            block = index.matrix[start:stop] @ q_t
+            block *= 100
+            for r in range(len(chunk)):
+                column = block[:, r]
+                best = top_k(column, top_n)
+                candidates[r].append((best + start, column[best]))
+            # column is a view: drop both so the block is freed before the next
+            del block, column
+        for r in range(len(chunk)):
+            yield position, _row_top(candidates[r], top_n)
+            position += 1
@@ -0,0 +1,228 @@
+# utils/cache.py
+"""
+Content-hash memoization for the text extractors.
+
+Users resubmit the same resume against different job descriptions, so the
+skill/keyword extraction results are cached under a hash of the normalized
+text. One byte-budgeted LRU is shared by every extractor; an optional
+on-disk tier (EXTRACT_CACHE_DIR) survives worker restarts and is pruned,
+least recently used first, to its own byte budget.
+"""
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+from utils.taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_CACHE_BYTES = int(os.environ.get("EXTRACT_CACHE_BYTES", str(32 * 1024 * 1024)))
+EXTRACT_CACHE_DIR = os.environ.get("EXTRACT_CACHE_DIR") or None
+EXTRACT_CACHE_DISK_BYTES = int(os.environ.get("EXTRACT_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+
+
+def normalize_text(text: str) -> str:
+    # only changes that cannot affect extraction results
+    return (text or "").replace("\r\n", "\n").strip()
+
+
+def text_key(namespace: str, text: str, *parts) -> str:
+    h = hashlib.sha256()
+    for part in (namespace,) + tuple(str(p) for p in parts):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    h.update(normalize_text(text).encode("utf-8", errors="surrogatepass"))
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU of pickled results, bounded by total pickled size.
+    Values are stored pickled so a hit always returns a fresh copy that the
+    caller may mutate. The disk tier (shared by every worker) is kept under
+    max_disk_bytes: once a worker's running total passes it, the oldest
+    files (by mtime, which hits refresh) are removed down to 90% of it.
+    """
+
+    def __init__(self, max_bytes: int, disk_dir: str = None, max_disk_bytes: int = EXTRACT_CACHE_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    def _disk_path(self, key: str):
+        return os.path.join(self.disk_dir, key[:2], key + ".pkl")
+
+    def _disk_files(self):
+        """
+        (mtime, size, path) of every entry in the disk tier.
+        """
+        out = []
+        for sub in os.scandir(self.disk_dir):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if not entry.name.endswith(".pkl"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    # removed by another worker meanwhile
+                    continue
+                out.append((st.st_mtime, st.st_size, entry.path))
+        return out
+
+    def _prune_disk(self):
+        """
+        Remove the least recently used files until the disk tier is under
+        90% of max_disk_bytes; one thread at a time, others skip.
+        """
+        if not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            files = sorted(self._disk_files())
+            total = sum(size for _, size, _ in files)
+            target = self.max_disk_bytes * 0.9
+            removed = 0
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            with self._lock:
+                self._disk_bytes = total
+                self.disk_evictions += removed
+        except OSError as e:
+            logger.warning("extract cache prune failed: %s", e)
+        finally:
+            self._prune_lock.release()
+
+    def get(self, key: str):
+        """
+        Return (True, value) on a hit, (False, None) on a miss.
+        """
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return True, pickle.loads(data)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                value = pickle.loads(data)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                # mark it recently used for pruning
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                self._remember(key, data)
+                with self._lock:
+                    self.disk_hits += 1
+                return True, value
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key: str, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, data)
+        if self.disk_dir and len(data) <= self.max_disk_bytes:
+            path = self._disk_path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning("extract cache write failed: %s", e)
+                return
+            with self._lock:
+                self._disk_bytes += len(data)
+                over = self._disk_bytes > self.max_disk_bytes
+            if over:
+                self._prune_disk()
+
+    def _remember(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes if self.disk_dir else 0,
+                "disk_evictions": self.disk_evictions,
+            }
+
+
+EXTRACTION_CACHE = ResultCache(EXTRACT_CACHE_BYTES, EXTRACT_CACHE_DIR)
+
+
+def memoize_text(namespace: str, cache: ResultCache = EXTRACTION_CACHE):
+    """
+    Cache fn(text, *args, **kwargs) by the hash of the normalized text, the
+    extra arguments and the taxonomy version (results depend on it).
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(text, *args, **kwargs):
+            key = text_key(namespace, text, get_taxonomy().version, args, sorted(kwargs.items()))
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            value = fn(text, *args, **kwargs)
+            cache.put(key, value)
+            return value
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
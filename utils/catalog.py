@@ -0,0 +1,132 @@
+# utils/catalog.py
+"""
+The job catalog as a hot-reloadable snapshot.
+
+A JobCatalog pairs the jobs (memory-mapped columns, SQLite store or
+parsed jobs.json) with the index over them: mapped from the files saved
+with the columns when it matches them, else built. The columns are used
+only while they are up to date with the files they were built from, and
+the store only while jobs.json has not been edited after it, so appended
+or edited jobs always reach matching. When any of these files changes, a
+new snapshot is built in the background and swapped in with one
+reference assignment (ReloadingResource); a request that took the old
+snapshot keeps using it until it finishes.
+"""
+import json
+import logging
+import os
+import threading
+
+from utils.bm25 import BM25Index
+from utils.columnar import COLUMNS_PATH, ColumnarJobs, file_stamp, is_stale, read_meta
+from utils.job_index import build_job_index, load_job_index
+from utils.job_store import JOB_STORE_PATH, JobStore
+from utils.reloader import ReloadingResource
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOBS_PATH = os.environ.get("JOBS_PATH", os.path.join(BASE_DIR, "jobs.json"))
+JOBS_POLL_SECONDS = float(os.environ.get("JOBS_POLL_SECONDS", "2"))
+# local /match ranking: tfidf (cosine) or bm25
+MATCH_RANKING = os.environ.get("MATCH_RANKING", "tfidf")
+
+
+class JobCatalog:
+    """
+    jobs: ColumnarJobs, JobStore or list of job dicts
+    index: JobIndex / HashedJobIndex, or BM25Index when ranking is bm25
+    (built unless a prebuilt one is passed)
+    """
+
+    __slots__ = ("jobs", "index", "ranking")
+
+    def __init__(self, jobs, ranking: str = MATCH_RANKING, index=None):
+        self.jobs = jobs
+        self.ranking = ranking
+        if index is None:
+            index = BM25Index(jobs) if ranking == "bm25" else build_job_index(jobs)
+        self.index = index
+
+    def __len__(self):
+        return len(self.jobs)
+
+
+def _edited_after(path: str, built: str) -> bool:
+    path_stamp, built_stamp = file_stamp(path), file_stamp(built)
+    return path_stamp is not None and built_stamp is not None and path_stamp[0] > built_stamp[0]
+
+
+def catalog_path() -> str:
+    """
+    The file the catalog is loaded from: the columnar catalog's meta.json
+    if it is up to date with its sources and jobs.json, else the job store
+    if jobs.json was not edited after it, else jobs.json.
+    """
+    columns_meta = os.path.join(COLUMNS_PATH, "meta.json")
+    meta = read_meta(COLUMNS_PATH)
+    if meta is not None:
+        if not is_stale(meta) and not _edited_after(JOBS_PATH, columns_meta):
+            return columns_meta
+        logger.warning("%s is out of date (its sources or jobs.json changed since it was built); "
+                       "rebuild it with python -m utils.columnar build", COLUMNS_PATH)
+    if os.path.exists(JOB_STORE_PATH):
+        if not _edited_after(JOBS_PATH, JOB_STORE_PATH):
+            return JOB_STORE_PATH
+        logger.warning("%s was edited after %s; serving it until it is imported again",
+                       JOBS_PATH, JOB_STORE_PATH)
+    return JOBS_PATH
+
+
+def watched_paths():
+    """
+    Every file whose change can change catalog_path() or its contents.
+    """
+    meta = read_meta(COLUMNS_PATH) or {}
+    paths = [os.path.join(COLUMNS_PATH, "meta.json"), JOB_STORE_PATH, JOBS_PATH]
+    paths += [p for p in meta.get("sources", {}) if p not in paths]
+    return paths
+
+
+def load_catalog(path: str) -> JobCatalog:
+    if os.path.basename(path) == "meta.json":
+        columns_dir = os.path.dirname(path)
+        columns = ColumnarJobs.load(columns_dir)
+        index = None if MATCH_RANKING == "bm25" else load_job_index(columns_dir, columns)
+        if index is None:
+            logger.warning("no saved match index for %s; building one", columns_dir)
+        return JobCatalog(columns, index=index)
+    if path.endswith(".db"):
+        return JobCatalog(JobStore(path))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            jobs = json.load(f)
+    except FileNotFoundError:
+        jobs = []
+    return JobCatalog(jobs)
+
+
+_resource = None
+_resource_lock = threading.Lock()
+
+
+def catalog_resource() -> ReloadingResource:
+    global _resource
+    if _resource is None:
+        with _resource_lock:
+            if _resource is None:
+                # the loader picks the file again: a change to any watched
+                # file can make a different one current
+                _resource = ReloadingResource(
+                    catalog_path(), lambda _: load_catalog(catalog_path()), JOBS_POLL_SECONDS,
+                    watch=watched_paths(),
+                )
+    return _resource
+
+
+def get_catalog() -> JobCatalog:
+    """
+    Current catalog snapshot. Take it once per request and use that object
+    throughout, so the request sees one consistent catalog.
+    """
+    return catalog_resource().get()
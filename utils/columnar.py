@@ -0,0 +1,292 @@
+# utils/columnar.py
+"""
+Columnar, memory-mappable job catalog.
+
+Instead of one dict and one list of keyword strings per job, the catalog
+is a handful of flat arrays: the titles as one UTF-8 byte array plus
+offsets, the keywords as int32 ids into a single interned vocabulary (CSR:
+keyword_ids[keyword_offsets[j]:keyword_offsets[j + 1]]), and any other job
+fields as JSON in a third byte column. Build it at deploy time with
+
+    python -m utils.columnar build jobs.json --out job_columns
+
+and every worker memory-maps the same files, so start-up does no parsing
+and the pages are shared. ColumnarJobs reads like a list of job dicts
+(len, iteration, indexing), building each dict on access. The build also
+saves the fitted match index next to the columns (utils.job_index), and
+meta.json records the source files, so a catalog whose sources have
+changed since is recognised as stale (see utils.catalog) and rebuilt by
+the tools that change them (refresh_columns).
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from array import array
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLUMNS_PATH = os.environ.get("COLUMNS_PATH", os.path.join(BASE_DIR, "job_columns"))
+
+_FIELDS = (
+    "title_bytes", "title_offsets", "keyword_ids", "keyword_offsets",
+    "vocab_bytes", "vocab_offsets", "extra_bytes", "extra_offsets",
+)
+
+
+def _strings(values):
+    """
+    (uint8 bytes, int64 offsets) for a sequence of str.
+    """
+    data = bytearray()
+    offsets = array("q", [0])
+    for value in values:
+        data += value.encode("utf-8")
+        offsets.append(len(data))
+    return np.frombuffer(bytes(data), dtype=np.uint8), np.asarray(offsets, dtype=np.int64)
+
+
+def _read_strings(data, offsets):
+    """
+    Inverse of _strings.
+    """
+    data = bytes(data)
+    offsets = np.asarray(offsets).tolist()
+    return [data[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+
+def write_array(path: str, filename: str, values):
+    """
+    Save values as path/filename through a temporary file, so a reader
+    never maps a half-written array.
+    """
+    tmp = os.path.join(path, f"{filename}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, np.ascontiguousarray(values))
+    os.replace(tmp, os.path.join(path, filename))
+
+
+def write_json(path: str, filename: str, value):
+    tmp = os.path.join(path, f"{filename}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(tmp, os.path.join(path, filename))
+
+
+def file_stamp(path: str):
+    """
+    [mtime_ns, size] of a file, or None if it is missing.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class ColumnarJobs:
+    """
+    title_bytes/title_offsets: UTF-8 titles, job j at [offsets[j]:offsets[j + 1]]
+    keyword_ids/keyword_offsets: CSR int32 ids into vocab
+    vocab: the distinct keywords, interned, in first-seen order
+    extra_bytes/extra_offsets: JSON of each job's other fields ("" if none)
+    version: content hash; file names carry it so a rebuild never
+    overwrites files another process has mapped
+    """
+
+    def __init__(self, title_bytes, title_offsets, keyword_ids, keyword_offsets, vocab,
+                 extra_bytes, extra_offsets, version: str = None):
+        self.title_bytes = title_bytes
+        self.title_offsets = title_offsets
+        self.keyword_ids = keyword_ids
+        self.keyword_offsets = keyword_offsets
+        self.vocab = [sys.intern(term) for term in vocab]
+        self.extra_bytes = extra_bytes
+        self.extra_offsets = extra_offsets
+        self.version = version or self._digest()
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        """
+        Build from any iterable of job dicts, streaming: only the columns
+        are held, never the dicts.
+        """
+        titles, extras = bytearray(), bytearray()
+        title_offsets, extra_offsets = array("q", [0]), array("q", [0])
+        keyword_ids, keyword_offsets = array("i"), array("q", [0])
+        ids = {}
+        for job in jobs:
+            titles += (job.get("title") or "").encode("utf-8")
+            title_offsets.append(len(titles))
+            for keyword in job.get("keywords", []):
+                keyword_ids.append(ids.setdefault(keyword, len(ids)))
+            keyword_offsets.append(len(keyword_ids))
+            extra = {k: v for k, v in job.items() if k not in ("title", "keywords")}
+            if extra:
+                extras += json.dumps(extra, ensure_ascii=False).encode("utf-8")
+            extra_offsets.append(len(extras))
+        return cls(
+            np.frombuffer(bytes(titles), dtype=np.uint8), np.asarray(title_offsets, dtype=np.int64),
+            np.asarray(keyword_ids, dtype=np.int32), np.asarray(keyword_offsets, dtype=np.int64),
+            list(ids),
+            np.frombuffer(bytes(extras), dtype=np.uint8), np.asarray(extra_offsets, dtype=np.int64),
+        )
+
+    def __len__(self):
+        return len(self.title_offsets) - 1
+
+    def title(self, j: int) -> str:
+        return bytes(self.title_bytes[self.title_offsets[j]:self.title_offsets[j + 1]]).decode("utf-8")
+
+    def job_keyword_ids(self, j: int):
+        return self.keyword_ids[self.keyword_offsets[j]:self.keyword_offsets[j + 1]]
+
+    def keywords(self, j: int):
+        vocab = self.vocab
+        return [vocab[k] for k in self.job_keyword_ids(j).tolist()]
+
+    def __getitem__(self, j: int):
+        n = len(self)
+        if j < 0:
+            j += n
+        if not 0 <= j < n:
+            raise IndexError("job index out of range")
+        start, stop = self.extra_offsets[j], self.extra_offsets[j + 1]
+        job = json.loads(bytes(self.extra_bytes[start:stop])) if stop > start else {}
+        job["title"] = self.title(j)
+        job["keywords"] = self.keywords(j)
+        return job
+
+    def __iter__(self):
+        for j in range(len(self)):
+            yield self[j]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the columns (mapped or not), excluding the vocab strings.
+        """
+        return sum(getattr(self, name).nbytes for name in _FIELDS if not name.startswith("vocab"))
+
+    def _digest(self) -> str:
+        h = hashlib.blake2b(digest_size=8)
+        for name in _FIELDS:
+            if name.startswith("vocab"):
+                continue
+            h.update(np.ascontiguousarray(getattr(self, name)).tobytes())
+        h.update("\0".join(self.vocab).encode("utf-8"))
+        return h.hexdigest()
+
+    def save(self, path: str, sources=None):
+        """
+        Write the columns as <field>.<version>.npy plus meta.json (written
+        last, so a reader never sees a half-built catalog), then remove the
+        column files of earlier versions; processes that mapped those keep
+        them until they let go. sources ({path: file_stamp}) are the files
+        the catalog was built from.
+        """
+        os.makedirs(path, exist_ok=True)
+        vocab_bytes, vocab_offsets = _strings(self.vocab)
+        columns = {name: getattr(self, name) for name in _FIELDS if not name.startswith("vocab")}
+        columns.update(vocab_bytes=vocab_bytes, vocab_offsets=vocab_offsets)
+        written = set()
+        for name, values in columns.items():
+            filename = f"{name}.{self.version}.npy"
+            write_array(path, filename, values)
+            written.add(filename)
+        meta = {"version": self.version, "n_jobs": len(self), "n_keywords": len(self.vocab),
+                "sources": sources or {}}
+        write_json(path, "meta.json", meta)
+        for filename in os.listdir(path):
+            if filename.split(".", 1)[0] in _FIELDS and filename.endswith(".npy") and filename not in written:
+                os.remove(os.path.join(path, filename))
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Memory-map a catalog written by save().
+        """
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        version = meta["version"]
+        columns = {
+            name: np.load(os.path.join(path, f"{name}.{version}.npy"), mmap_mode="r")
+            for name in _FIELDS
+        }
+        vocab = _read_strings(columns.pop("vocab_bytes"), columns.pop("vocab_offsets"))
+        return cls(vocab=vocab, version=version, **columns)
+
+
+def read_meta(path: str = COLUMNS_PATH):
+    """
+    The catalog's meta.json, or None if there is no catalog at path.
+    """
+    try:
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_stale(meta) -> bool:
+    """
+    Whether any source file changed (or went missing) since the catalog
+    described by meta was built.
+    """
+    return any(file_stamp(source) != stamp for source, stamp in meta.get("sources", {}).items())
+
+
+def build_columns(sources, out: str = COLUMNS_PATH, index: bool = True) -> ColumnarJobs:
+    """
+    Build and save the columnar catalog from .json / .jsonl feeds or a
+    job store (.db), plus its match index unless index is False.
+    """
+    from utils.job_index import build_job_index, save_job_index
+    from utils.job_store import JobStore, iter_feed
+
+    sources = [os.path.abspath(path) for path in sources]
+    # stamped before reading, so a change made during the build shows as stale
+    stamps = {path: file_stamp(path) for path in sources}
+
+    def jobs():
+        for path in sources:
+            yield from (JobStore(path) if path.endswith(".db") else iter_feed(path))
+
+    columns = ColumnarJobs.from_jobs(jobs())
+    if index:
+        # the index goes first: meta.json is what readers watch
+        os.makedirs(out, exist_ok=True)
+        save_job_index(build_job_index(columns), out, columns.version)
+    columns.save(out, stamps)
+    return columns
+
+
+def refresh_columns(source: str, out: str = COLUMNS_PATH):
+    """
+    Rebuild the catalog at out if it was built from source, after source
+    has changed (job store import, ingest). Returns the new ColumnarJobs,
+    or None if there is no such catalog.
+    """
+    meta = read_meta(out)
+    if meta is None or os.path.abspath(source) not in meta.get("sources", {}):
+        return None
+    return build_columns(list(meta["sources"]), out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the columnar job catalog.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="build from .json / .jsonl feeds or a jobs.db")
+    build.add_argument("sources", nargs="+")
+    build.add_argument("--out", default=COLUMNS_PATH)
+    build.add_argument("--no-index", action="store_true", help="skip saving the match index")
+    args = parser.parse_args(argv)
+    columns = build_columns(args.sources, args.out, index=not args.no_index)
+    print(f"{len(columns)} jobs, {len(columns.vocab)} distinct keywords, "
+          f"{columns.nbytes / 2**20:.1f} MB of columns -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
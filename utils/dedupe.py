@@ -0,0 +1,317 @@
+# utils/dedupe.py
+"""
+Near-duplicate job detection with MinHash and LSH banding.
+
+A job is reduced to a set of shingles (its title words, its keywords,
+and its company and location) and that set to num_perm MinHash values; two jobs agree on any one value
+with probability equal to the Jaccard similarity of their sets. The
+signature is cut into bands, and only jobs sharing a whole band with an
+earlier job are compared, so a feed is deduplicated in about linear time.
+A job is a duplicate when its estimated similarity to an earlier kept job
+reaches the threshold. Collapsed jobs are kept whole (as JSON) in
+job_duplicates, and the report lists every cluster.
+
+    python -m utils.dedupe report --db jobs.db
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from array import array
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from utils.job_store import JOB_STORE_PATH
+from utils.tokenizer import tokenize
+
+DEDUPE_THRESHOLD = float(os.environ.get("DEDUPE_THRESHOLD", "0.8"))
+DEDUPE_NUM_PERM = int(os.environ.get("DEDUPE_NUM_PERM", "64"))
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# kept signatures are stored in preallocated blocks of this many rows
+_BLOCK_ROWS = 4096
+# fields that tell apart postings of the same role, one shingle each
+IDENTITY_FIELDS = ("company", "location")
+
+_DUPLICATES = """
+CREATE TABLE IF NOT EXISTS job_duplicates (
+    kept_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    job TEXT
+);
+CREATE INDEX IF NOT EXISTS job_duplicates_kept ON job_duplicates (kept_id);
+"""
+
+
+def shingles(job: dict):
+    """
+    Title words, whole keywords and the IDENTITY_FIELDS values, tagged so
+    a title word never equals a keyword or a company.
+    """
+    out = {"t:" + t for t in tokenize(job.get("title") or "").tokens}
+    out.update("k:" + " ".join(str(k).lower().split()) for k in job.get("keywords") or [])
+    for field in IDENTITY_FIELDS:
+        value = " ".join(str(job.get(field) or "").lower().split())
+        if value:
+            out.add(f"{field[0]}:{value}")
+    return out
+
+
+@lru_cache(maxsize=1 << 16)
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def choose_bands(threshold: float, num_perm: int, miss_weight: float = 0.8):
+    """
+    (bands, rows) with bands * rows == num_perm minimizing the weighted
+    chance of banding missing a pair above threshold or surfacing one
+    below it. Misses weigh more: a surfaced pair only costs a signature
+    comparison, a missed one is a duplicate kept.
+    """
+    def error(br):
+        bands, rows = br
+        below = np.linspace(0, threshold, 100)
+        above = np.linspace(threshold, 1, 100)
+        surfaced = np.mean(1 - (1 - below ** rows) ** bands) * threshold
+        missed = np.mean((1 - above ** rows) ** bands) * (1 - threshold)
+        return (1 - miss_weight) * surfaced + miss_weight * missed
+
+    return min(((b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0), key=error)
+
+
+class DuplicateIndex:
+    """
+    LSH band index over the MinHash signatures of the jobs kept so far.
+    add() decides, job by job, whether a job duplicates one already kept.
+    Kept jobs live in flat arrays, about 4 * num_perm + 16 to 24 * bands
+    bytes each (400 to 460 at the defaults): the signatures as rows of
+    preallocated uint32 blocks, and per band an int64 hash of the band's
+    values plus an open-addressing table of rows keyed by it.
+    """
+
+    def __init__(self, threshold: float = DEDUPE_THRESHOLD, num_perm: int = DEDUPE_NUM_PERM, seed: int = 1,
+                 capacity: int = 1024):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        # (a * x + b) mod p with a, b < 2**31 and x < 2**32 cannot overflow
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        # odd multipliers hashing a band's values to one 64-bit key
+        self._mix = rng.integers(0, 1 << 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._n = 0
+        self._blocks = []
+        self._job_ids = array("q")
+        # band key of row r in band b at r * bands + b
+        self._keys = array("q")
+        self._table_bits = 0
+        self._slots = array("i")
+        self.reserve(capacity)
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def nbytes(self) -> int:
+        return (sum(block.nbytes for block in self._blocks) + self._job_ids.itemsize * len(self._job_ids)
+                + self._keys.itemsize * len(self._keys) + self._slots.itemsize * len(self._slots))
+
+    def reserve(self, n: int):
+        """
+        Make room for n kept jobs without growing again.
+        """
+        while len(self._blocks) * _BLOCK_ROWS < n:
+            self._blocks.append(np.zeros((_BLOCK_ROWS, self.num_perm), dtype=np.uint32))
+        bits = self._table_bits
+        # tables at most half full, so probe runs stay short
+        while (1 << bits) < 2 * n:
+            bits += 1
+        if bits != self._table_bits:
+            self._rehash(bits)
+
+    def _rehash(self, bits: int):
+        self._table_bits = bits
+        self._slots = array("i", [-1]) * (self.bands << bits)
+        for row in range(self._n):
+            self._link(row)
+
+    def _start(self, key: int) -> int:
+        # high bits: the low bits of a multiplicative hash are the weak ones
+        return (key & 0xFFFFFFFFFFFFFFFF) >> (64 - self._table_bits)
+
+    def _link(self, row: int):
+        slots, size, mask = self._slots, 1 << self._table_bits, (1 << self._table_bits) - 1
+        for band in range(self.bands):
+            base = band * size
+            slot = self._start(self._keys[row * self.bands + band])
+            while slots[base + slot] >= 0:
+                slot = (slot + 1) & mask
+            slots[base + slot] = row
+
+    def signatures(self, jobs):
+        """
+        (len(jobs) x num_perm) uint32 MinHash signatures, computed for the
+        whole batch at once. A job without shingles gets all-max values.
+        """
+        sets = [shingles(job) for job in jobs]
+        sizes = np.fromiter((len(s) for s in sets), dtype=np.int64, count=len(sets))
+        out = np.full((len(sets), self.num_perm), 0xFFFFFFFF, dtype=np.uint32)
+        if not sizes.sum():
+            return out
+        x = np.fromiter((_shingle_hash(sh) for s in sets for sh in s), dtype=np.uint64, count=int(sizes.sum()))
+        hashed = ((x[:, None] * self._a + self._b) % _PRIME) & _MAX_HASH
+        nonempty = sizes > 0
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))[nonempty]
+        out[nonempty] = np.minimum.reduceat(hashed, starts, axis=0).astype(np.uint32)
+        return out
+
+    def band_keys(self, signatures):
+        """
+        (n x bands) int64 hash of each band of each signature, as lists.
+        """
+        banded = np.asarray(signatures, dtype=np.uint64).reshape(len(signatures), self.bands, self.rows)
+        return (banded * self._mix).sum(axis=2, dtype=np.uint64).view(np.int64).tolist()
+
+    def add(self, job_id: int, signature, keys=None):
+        """
+        (kept_id, similarity) if the job is a near-duplicate of a kept job,
+        else None, in which case the job is kept and indexed under job_id.
+        keys are its band_keys, when already computed for a batch.
+        """
+        if keys is None:
+            keys = self.band_keys(signature[None])[0]
+        slots, all_keys, bands = self._slots, self._keys, self.bands
+        size, mask = 1 << self._table_bits, (1 << self._table_bits) - 1
+        best = None
+        seen = set()
+        for band, key in enumerate(keys):
+            base = band * size
+            slot = self._start(key)
+            row = slots[base + slot]
+            while row >= 0:
+                if all_keys[row * bands + band] == key and row not in seen:
+                    seen.add(row)
+                    kept = self._blocks[row // _BLOCK_ROWS][row % _BLOCK_ROWS]
+                    similarity = np.count_nonzero(kept == signature) / self.num_perm
+                    if similarity >= self.threshold and (best is None or similarity > best[1]):
+                        best = (self._job_ids[row], similarity)
+                slot = (slot + 1) & mask
+                row = slots[base + slot]
+        if best is not None:
+            return best
+        row = self._n
+        if row >= len(self._blocks) * _BLOCK_ROWS or 2 * (row + 1) > size:
+            self.reserve(row + 1)
+        self._blocks[row // _BLOCK_ROWS][row % _BLOCK_ROWS] = signature
+        self._job_ids.append(job_id)
+        self._keys.extend(keys)
+        self._n += 1
+        self._link(row)
+        return None
+
+    def collapse(self, jobs, first_id: int):
+        """
+        Split a batch into (kept jobs, [(kept_id, job, similarity)]); the
+        kept jobs are numbered from first_id in order, as the store will
+        number them.
+        """
+        kept, duplicates = [], []
+        signatures = self.signatures(jobs)
+        for job, signature, keys in zip(jobs, signatures, self.band_keys(signatures)):
+            match = self.add(first_id + len(kept), signature, keys)
+            if match is None:
+                kept.append(job)
+            else:
+                duplicates.append((match[0], job, match[1]))
+        return kept, duplicates
+
+    def seed(self, conn, batch: int = 5000):
+        """
+        Index the jobs already in the store behind conn, so a resumed or
+        appended ingest also collapses duplicates of earlier feeds. The
+        store is read batch rows at a time and the arrays sized once up
+        front.
+        """
+        self.reserve(len(self) + conn.execute("SELECT count(*) FROM jobs").fetchone()[0])
+        cursor = conn.execute("SELECT id, title, keywords, extra FROM jobs ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                break
+            jobs = [dict(json.loads(extra) if extra else {}, title=title, keywords=json.loads(keywords))
+                    for _, title, keywords, extra in rows]
+            signatures = self.signatures(jobs)
+            for (job_id, *_), signature, keys in zip(rows, signatures, self.band_keys(signatures)):
+                self.add(job_id - 1, signature, keys)
+
+
+def create_duplicates_table(conn):
+    conn.executescript(_DUPLICATES)
+    # tables from before the job column
+    if "job" not in {row[1] for row in conn.execute("PRAGMA table_info(job_duplicates)")}:
+        conn.execute("ALTER TABLE job_duplicates ADD COLUMN job TEXT")
+
+
+def record_duplicates(conn, duplicates):
+    """
+    Store [(kept_id, job, similarity)] (kept_id 0-based), the whole job
+    as JSON so a collapsed posting can be recovered; runs inside the
+    caller's transaction.
+    """
+    conn.executemany(
+        "INSERT INTO job_duplicates (kept_id, title, keywords, similarity, job) VALUES (?, ?, ?, ?, ?)",
+        [(kept, job.get("title") or "", json.dumps(job.get("keywords") or [], ensure_ascii=False), sim,
+          json.dumps(job, ensure_ascii=False))
+         for kept, job, sim in duplicates],
+    )
+
+
+def cluster_report(db_path: str = JOB_STORE_PATH, top: int = 20):
+    """
+    {"clusters": n, "duplicates": n, "largest": [...]} from the duplicates
+    recorded at ingest; each cluster is the kept job plus the titles that
+    were collapsed into it.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        try:
+            rows = conn.execute("SELECT kept_id, title, similarity FROM job_duplicates").fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        clusters = defaultdict(list)
+        for kept, title, similarity in rows:
+            clusters[kept].append((title, round(similarity, 3)))
+        largest = sorted(clusters.items(), key=lambda kv: (-len(kv[1]), kv[0]))[:top]
+        report = []
+        for kept, dups in largest:
+            title = conn.execute("SELECT title FROM jobs WHERE id = ?", (kept + 1,)).fetchone()
+            report.append({
+                "kept_id": kept,
+                "kept_title": title[0] if title else None,
+                "size": len(dups) + 1,
+                "duplicates": [{"title": t, "similarity": s} for t, s in dups[:10]],
+            })
+        return {"clusters": len(clusters), "duplicates": len(rows), "largest": report}
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Near-duplicate job clusters found at ingest.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("report")
+    rep.add_argument("--db", default=JOB_STORE_PATH)
+    rep.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+    print(json.dumps(cluster_report(args.db, args.top), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# utils/fuzzy.py
+"""
+Bounded-edit-distance skill lookup ("Kubernates", "Postgre SQL", "Tensor flow").
+
+Symmetric-delete index: every taxonomy surface form is stored under all of
+its variants with up to max_distance characters deleted. A query term only
+has to generate its own deletes and look them up, then the few candidates
+are verified with a bounded edit distance. No scan over the taxonomy.
+"""
+import re
+
+_SQUASH = re.compile(r"[^\w+#]+")
+
+
+def squash(term: str) -> str:
+    """
+    Lowercase and drop spaces/punctuation: "Node.js" -> "nodejs".
+    """
+    return _SQUASH.sub("", (term or "").lower())
+
+
+def _deletes(word: str, distance: int):
+    out = {word}
+    frontier = {word}
+    for _ in range(distance):
+        nxt = set()
+        for w in frontier:
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1:])
+        out |= nxt
+        frontier = nxt
+    return out
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal-string-alignment distance between a and b, or limit + 1 as soon
+    as it is certain to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v
+            best = min(best, v)
+        if best > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def allowed_distance(length: int) -> int:
+    # short words are too easy to confuse ("spark"/"stark", "docker"/"locker")
+    if length >= 10:
+        return 2
+    if length >= 7:
+        return 1
+    return 0
+
+
+class FuzzyIndex:
+    """
+    Precomputed symmetric-delete index over squashed skill surface forms.
+    surfaces maps surface form -> skill id (aliases included).
+    """
+
+    def __init__(self, surfaces, max_distance: int = 2):
+        self.max_distance = max_distance
+        self._exact = {}
+        self._deletes = {}
+        for surface, skill_id in surfaces.items():
+            key = squash(surface)
+            if not key or key in self._exact:
+                continue
+            self._exact[key] = skill_id
+            for variant in _deletes(key, min(max_distance, allowed_distance(len(key)))):
+                self._deletes.setdefault(variant, []).append(key)
+        self._cache = {}
+
+    def lookup(self, term: str):
+        """
+        Skill id of the closest surface form within the allowed distance of
+        term (already squashed), or None.
+        """
+        if term in self._exact:
+            return self._exact[term]
+        limit = min(self.max_distance, allowed_distance(len(term)))
+        if not limit:
+            return None
+        cached = self._cache.get(term, False)
+        if cached is not False:
+            return cached
+        best, best_dist = None, limit + 1
+        for variant in _deletes(term, limit):
+            for key in self._deletes.get(variant, ()):
+                if allowed_distance(len(key)) == 0:
+                    continue
+                dist = edit_distance(term, key, min(limit, allowed_distance(len(key))))
+                if dist < best_dist or (dist == best_dist and self._exact[key] < best):
+                    best, best_dist = self._exact[key], dist
+        if len(self._cache) > 50000:
+            self._cache.clear()
+        self._cache[term] = best
+        return best
+
+    def scan(self, doc):
+        """
+        Yield (skill_id, start, end) for misspelled single tokens of a
+        TokenizedDoc and for pairs of adjacent tokens that spell a skill
+        when joined ("Postgre SQL", "Tensor flow").
+        Exact single-token hits are left to the exact matcher.
+        """
+        tokens, starts, ends = doc.tokens, doc.starts, doc.ends
+        for i, token in enumerate(tokens):
+            if token not in self._exact:
+                skill_id = self.lookup(token)
+                if skill_id is not None:
+                    yield skill_id, starts[i], ends[i]
+            if i:
+                skill_id = self._exact.get(tokens[i - 1] + token)
+                if skill_id is not None:
+                    yield skill_id, starts[i - 1], ends[i]
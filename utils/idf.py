@@ -0,0 +1,282 @@
+# utils/idf.py
+"""
+Fixed corpus IDF for pairwise (resume vs job description) TF-IDF scoring.
+
+IDF fitted on just the two documents being compared says almost nothing,
+so pairwise scores use document frequencies from a corpus instead: the job
+catalog (title, description and keywords of every job) plus a sample of
+resumes (resume_sample.jsonl by default), which is where ordinary prose
+gets its low weight when the catalog holds only keyword lists. English
+stop words are left out altogether, and a term the corpus never saw gets
+a typical (median) weight rather than the highest. The table is built
+offline
+
+    python -m utils.idf build --jobs jobs.db --resumes resume_sample.jsonl --out idf_model
+
+(--jobs takes the job store, .json arrays or .jsonl feeds) into a
+directory of flat arrays (sorted 64-bit term hashes and their float32
+idf) that every worker memory-maps, so the pages are shared and loading
+costs nothing. File names carry the model version, so a rebuild never
+rewrites arrays a running worker has mapped. A vector is then a plain
+transform (term counts x IDF) and a similarity a dot product, with nothing
+fitted per request. Without a built table the catalog is fitted in memory
+on first use.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import threading
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from utils.columnar import write_array, write_json
+from utils.job_store import JobStore, iter_feed
+from utils.tokenizer import analyze, analyze_uncached
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IDF_JOBS_PATH = os.environ.get("IDF_JOBS_PATH", os.path.join(BASE_DIR, "jobs.json"))
+IDF_RESUMES_PATH = os.environ.get("IDF_RESUMES_PATH", os.path.join(BASE_DIR, "resume_sample.jsonl"))
+IDF_MODEL_DIR = os.environ.get("IDF_MODEL_DIR", os.path.join(BASE_DIR, "idf_model"))
+# never weighted: they say nothing about a match ("and", "the", "we")
+STOP_WORDS = ENGLISH_STOP_WORDS
+
+
+@lru_cache(maxsize=1 << 16)
+def term_hash(term: str) -> int:
+    """
+    Stable 64-bit hash of a term (the same in every process and build);
+    cached, since the same vocabulary keeps coming back.
+    """
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _occurrence_mean_idf(idf, n_docs: int) -> float:
+    """
+    Mean idf weighted by document frequency (recovered from the smoothed
+    idf), i.e. the idf of an average term occurrence in the corpus.
+    """
+    if not len(idf):
+        return math.log(1 + n_docs) + 1
+    idf = np.asarray(idf, dtype=np.float64)
+    df = (1 + n_docs) / np.exp(idf - 1) - 1
+    return float((df * idf).sum() / df.sum())
+
+
+class IdfModel:
+    """
+    hashes: sorted uint64 term hashes (see term_hash)
+    idf: parallel float32 smoothed idf, log((1 + N) / (1 + df)) + 1
+    oov_idf: weight of a term the corpus never saw: the mean idf over the
+    corpus's term occurrences (a typical word's), not the highest idf, so
+    an unknown word does not outweigh every known one
+    version: content hash, for caches of vectors built with this model
+    Both arrays may be read-only memory maps.
+    """
+
+    def __init__(self, hashes, idf, n_docs: int, version: str):
+        self.hashes = hashes
+        self.idf = idf
+        self.n_docs = n_docs
+        self.oov_idf = _occurrence_mean_idf(idf, n_docs)
+        self.version = version
+
+    @classmethod
+    def from_documents(cls, docs):
+        """
+        Fit on an iterable of texts; stop words are not counted.
+        """
+        df = Counter()
+        n_docs = 0
+        for doc in docs:
+            df.update(set(analyze_uncached(doc)).difference(STOP_WORDS))
+            n_docs += 1
+        return cls.from_counts(df, n_docs)
+
+    @classmethod
+    def from_counts(cls, df: Counter, n_docs: int):
+        hashed = sorted((term_hash(t), count) for t, count in df.items())
+        hashes = np.fromiter((h for h, _ in hashed), dtype=np.uint64, count=len(hashed))
+        counts = np.fromiter((c for _, c in hashed), dtype=np.float64, count=len(hashed))
+        idf = (np.log((1 + n_docs) / (1 + counts)) + 1).astype(np.float32)
+        h = hashlib.sha1(str(n_docs).encode("utf-8"))
+        h.update(hashes.tobytes())
+        h.update(idf.tobytes())
+        return cls(hashes, idf, n_docs, h.hexdigest()[:16])
+
+    def __len__(self):
+        return len(self.idf)
+
+    def weights(self, terms):
+        """
+        idf of each term in terms (a sequence), as a float array; one
+        vectorized lookup for the lot.
+        """
+        keys = np.fromiter((term_hash(t) for t in terms), dtype=np.uint64, count=len(terms))
+        out = np.full(len(keys), self.oov_idf, dtype=np.float64)
+        if len(self.hashes):
+            rows = np.minimum(np.searchsorted(self.hashes, keys), len(self.hashes) - 1)
+            found = self.hashes[rows] == keys
+            out[found] = self.idf[rows[found]]
+        return out
+
+    def weight(self, term: str) -> float:
+        return float(self.weights([term])[0])
+
+    def vector(self, text: str):
+        """
+        L2-normalized TF-IDF vector of text as {term: weight}, without stop
+        words; terms outside the corpus get oov_idf rather than being dropped.
+        """
+        counts = Counter(t for t in analyze(text or "") if t not in STOP_WORDS)
+        terms = list(counts)
+        weights = self.weights(terms) * np.fromiter(counts.values(), dtype=np.float64, count=len(terms))
+        norm = math.sqrt(float(weights @ weights)) if len(terms) else 0.0
+        if norm:
+            weights /= norm
+        return dict(zip(terms, weights.tolist()))
+
+    def save(self, path: str):
+        """
+        Write the model as a directory: hashes.<version>.npy and
+        idf.<version>.npy through temporary files, then meta.json, then
+        remove the arrays of earlier versions (workers that mapped them
+        keep them until they let go).
+        """
+        os.makedirs(path, exist_ok=True)
+        written = {f"hashes.{self.version}.npy", f"idf.{self.version}.npy"}
+        write_array(path, f"hashes.{self.version}.npy", self.hashes)
+        write_array(path, f"idf.{self.version}.npy", self.idf)
+        write_json(path, "meta.json", {"n_docs": self.n_docs, "n_terms": len(self), "version": self.version})
+        for filename in os.listdir(path):
+            if filename.endswith(".npy") and filename not in written:
+                os.remove(os.path.join(path, filename))
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Memory-map a model written by save().
+        """
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        version = meta["version"]
+        hashes = np.load(os.path.join(path, f"hashes.{version}.npy"), mmap_mode="r")
+        idf = np.load(os.path.join(path, f"idf.{version}.npy"), mmap_mode="r")
+        return cls(hashes, idf, meta["n_docs"], version)
+
+
+def cosine(a: dict, b: dict) -> float:
+    """
+    Dot product of two normalized vectors from IdfModel.vector().
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    return sum((w * b.get(term, 0.0) for term, w in a.items()), 0.0)
+
+
+def job_text(job: dict) -> str:
+    """
+    All the words of a job: title, description and keywords.
+    """
+    return " ".join([job.get("title") or "", job.get("description") or ""] + list(job.get("keywords") or []))
+
+
+def iter_job_documents(paths):
+    """
+    job_text of every job in a job store (.db), .json arrays and .jsonl
+    feeds, streamed; missing files are skipped.
+    """
+    for path in paths:
+        if not os.path.exists(path):
+            logger.warning("no job catalog at %s", path)
+            continue
+        for job in JobStore(path) if path.endswith(".db") else iter_feed(path):
+            yield job_text(job)
+
+
+def iter_resume_texts(paths):
+    """
+    Texts from .txt files, directories of them, and .jsonl files with a
+    "text" field per line; missing paths are skipped.
+    """
+    for path in paths:
+        if not os.path.exists(path):
+            logger.warning("no resume sample at %s", path)
+        elif os.path.isdir(path):
+            names = sorted(n for n in os.listdir(path) if n.endswith((".txt", ".jsonl")))
+            yield from iter_resume_texts(os.path.join(path, n) for n in names)
+        elif path.endswith(".jsonl"):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line).get("text", "")
+        else:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                yield f.read()
+
+
+def build_idf(jobs_paths=(IDF_JOBS_PATH,), resume_paths=(IDF_RESUMES_PATH,)) -> IdfModel:
+    """
+    Corpus IDF over the job catalog (store, .json or .jsonl files) plus the
+    resume sample.
+    """
+    if isinstance(jobs_paths, str):
+        jobs_paths = [jobs_paths]
+    if isinstance(resume_paths, str):
+        resume_paths = [resume_paths]
+    return IdfModel.from_documents(itertools.chain(iter_job_documents(jobs_paths), iter_resume_texts(resume_paths)))
+
+
+def load_idf_model(path: str = IDF_MODEL_DIR) -> IdfModel:
+    """
+    The built table at path, or the catalog fitted in memory if there is
+    none.
+    """
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return IdfModel.load(path)
+    logger.info("no IDF table at %s; fitting on %s and %s", path, IDF_JOBS_PATH, IDF_RESUMES_PATH)
+    return build_idf()
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_idf_model() -> IdfModel:
+    """
+    The process-wide corpus IDF, loaded on first use.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_idf_model()
+    return _model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the corpus IDF table.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build")
+    build.add_argument("--jobs", nargs="+", default=[IDF_JOBS_PATH],
+                       help="job catalog: a job store (.db), .json arrays or .jsonl feeds")
+    build.add_argument("--resumes", nargs="*", default=[IDF_RESUMES_PATH],
+                       help="resume sample: .txt files, directories, or .jsonl with a text field")
+    build.add_argument("--out", default=IDF_MODEL_DIR)
+    args = parser.parse_args(argv)
+    model = build_idf(args.jobs, args.resumes)
+    model.save(args.out)
+    print(f"{len(model)} terms from {model.n_docs} documents -> {args.out} (version {model.version})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# utils/ingest.py
+"""
+Streaming ingestion of large JSONL job feeds into the job store.
+
+The feed is read line by line (never parsed whole), each job's keywords
+are normalized through the skill taxonomy, and jobs are appended to the
+SQLite store in batches, so memory stays at one batch however big the
+feed is. The byte offset reached is saved in the same transaction as each
+batch, so an interrupted ingest picks up exactly where the last batch
+ended. Near-duplicates of jobs already kept (utils.dedupe, MinHash
+similarity >= DEDUPE_THRESHOLD) are collapsed rather than stored:
+
+    python -m utils.ingest feed.jsonl --db jobs.db
+    python -m utils.dedupe report --db jobs.db
+
+Afterwards the columnar catalog is rebuilt if it was built from that
+store, so the new jobs reach matching in mapped form too.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+from utils.columnar import refresh_columns
+from utils.dedupe import DEDUPE_THRESHOLD, DuplicateIndex, create_duplicates_table, record_duplicates
+from utils.job_store import JOB_STORE_PATH, append_jobs, connect_writable
+from utils.taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+INGEST_BATCH = int(os.environ.get("INGEST_BATCH", "2000"))
+# seconds between throughput reports
+REPORT_SECONDS = 5.0
+
+_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+    source TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    jobs INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+def read_feed(path: str, offset: int = 0):
+    """
+    Yield (byte offset after the line, job dict) for every line of a JSONL
+    feed from offset on. Lines that are not JSON objects are logged and
+    yielded as None.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                logger.warning("%s: skipping bad line ending at byte %d: %s", path, offset, e)
+                job = None
+            yield offset, job if isinstance(job, dict) else None
+
+
+def normalize_keywords(keywords, taxonomy):
+    """
+    Lowercased, whitespace-collapsed keywords with aliases mapped to their
+    canonical skill ("k8s" -> "kubernetes"), duplicates dropped, in order.
+    A comma-separated string is split first.
+    """
+    if isinstance(keywords, str):
+        keywords = keywords.split(",")
+    out = []
+    seen = set()
+    for keyword in keywords or []:
+        keyword = " ".join(str(keyword).lower().split())
+        if not keyword:
+            continue
+        keyword = taxonomy.canonical(keyword) or keyword
+        if keyword not in seen:
+            seen.add(keyword)
+            out.append(keyword)
+    return out
+
+
+def normalize_job(job: dict, taxonomy):
+    """
+    The job with a clean title and normalized keywords, or None if it has
+    neither.
+    """
+    title = " ".join(str(job.get("title") or "").split())
+    keywords = normalize_keywords(job.get("keywords"), taxonomy)
+    if not title and not keywords:
+        return None
+    return dict(job, title=title, keywords=keywords)
+
+
+def _checkpoint(conn, source: str):
+    row = conn.execute("SELECT offset, jobs FROM ingest_checkpoints WHERE source = ?", (source,)).fetchone()
+    return row or (0, 0)
+
+
+def ingest_feed(path: str, db_path: str = JOB_STORE_PATH, batch: int = INGEST_BATCH,
+                restart: bool = False, report=None, dedupe: float = DEDUPE_THRESHOLD):
+    """
+    Ingest a JSONL feed into the job store at db_path, resuming from the
+    feed's checkpoint unless restart. Jobs at least dedupe similar to a
+    stored job are recorded as its duplicates instead (0 keeps everything).
+    report(stats) is called every REPORT_SECONDS and at the end. Returns
+    the final stats dict.
+    """
+    source = os.path.abspath(path)
+    taxonomy = get_taxonomy()
+    conn = connect_writable(db_path)
+    try:
+        conn.executescript(_CHECKPOINTS)
+        offset, total = (0, 0) if restart else _checkpoint(conn, source)
+        if offset > os.path.getsize(path):
+            logger.warning("%s is shorter than its checkpoint; starting over", path)
+            offset, total = 0, 0
+        duplicates = DuplicateIndex(dedupe) if dedupe > 0 else None
+        if duplicates is not None:
+            create_duplicates_table(conn)
+            duplicates.seed(conn)
+        # feed_jobs: jobs stored from this feed over all runs; store_jobs: the
+        # whole store
+        in_store = conn.execute("SELECT count(*) FROM jobs").fetchone()[0]
+        stats = {"source": source, "resumed_at": offset, "read": 0, "ingested": 0, "skipped": 0,
+                 "duplicates": 0, "seconds": 0.0, "jobs_per_sec": 0.0, "feed_jobs": total, "store_jobs": in_store}
+        t0 = time.perf_counter()
+        next_report = t0 + REPORT_SECONDS
+        pending = []
+        end = offset
+
+        def flush():
+            with conn:
+                kept = pending
+                if duplicates is not None:
+                    first_id = conn.execute("SELECT coalesce(max(id), 0) FROM jobs").fetchone()[0]
+                    kept, dups = duplicates.collapse(pending, first_id)
+                    record_duplicates(conn, dups)
+                    stats["duplicates"] += len(dups)
+                stats["ingested"] += append_jobs(conn, kept)
+                stats["feed_jobs"] = total + stats["ingested"]
+                stats["store_jobs"] = in_store + stats["ingested"]
+                conn.execute(
+                    "INSERT OR REPLACE INTO ingest_checkpoints (source, offset, jobs, updated) VALUES (?, ?, ?, ?)",
+                    (source, end, stats["feed_jobs"], time.time()),
+                )
+            pending.clear()
+
+        def update(now):
+            stats["seconds"] = round(now - t0, 3)
+            stats["jobs_per_sec"] = round(stats["read"] / max(now - t0, 1e-9), 1)
+
+        for end, job in read_feed(path, offset):
+            stats["read"] += 1
+            job = normalize_job(job, taxonomy) if job is not None else None
+            if job is None:
+                stats["skipped"] += 1
+            else:
+                pending.append(job)
+            if len(pending) >= batch:
+                flush()
+                now = time.perf_counter()
+                if report and now >= next_report:
+                    update(now)
+                    report(stats)
+                    next_report = now + REPORT_SECONDS
+        # the final flush also records the offset past trailing skipped lines
+        flush()
+        update(time.perf_counter())
+        if report:
+            report(stats)
+        return stats
+    finally:
+        conn.close()
+
+
+def _print_report(stats):
+    print(f"{stats['read']} read, {stats['ingested']} ingested, {stats['duplicates']} duplicates, "
+          f"{stats['skipped']} skipped "
+          f"in {stats['seconds']:.1f}s ({stats['jobs_per_sec']:.0f} jobs/s); "
+          f"{stats['feed_jobs']} from this feed, {stats['store_jobs']} in store")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream JSONL job feeds into the job store.")
+    parser.add_argument("feeds", nargs="+", help=".jsonl job feeds")
+    parser.add_argument("--db", default=JOB_STORE_PATH)
+    parser.add_argument("--batch", type=int, default=INGEST_BATCH)
+    parser.add_argument("--restart", action="store_true", help="ignore checkpoints and read each feed from the start")
+    parser.add_argument("--dedupe-threshold", type=float, default=DEDUPE_THRESHOLD,
+                        help="MinHash similarity at which a job is collapsed into an earlier one (0 disables)")
+    args = parser.parse_args(argv)
+    for feed in args.feeds:
+        ingest_feed(feed, args.db, args.batch, args.restart, report=_print_report, dedupe=args.dedupe_threshold)
+    columns = refresh_columns(args.db)
+    if columns is not None:
+        print(f"rebuilt the columnar catalog: {len(columns)} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# utils/inverted_index.py
+"""
+Inverted index from term id to the jobs that use the term.
+
+Used to prune the catalog before cosine scoring: a job that shares no term
+with the resume scores 0 anyway, so only the union of the resume terms'
+posting lists needs to be scored.
+"""
+import numpy as np
+
+
+class InvertedIndex:
+    """
+    Posting lists in CSR form: the jobs using term t are
+    job_ids[indptr[t]:indptr[t + 1]] (int32, ascending), with the job's
+    weight for the term in the parallel float32 weights array.
+    """
+
+    def __init__(self, indptr, job_ids, n_jobs: int, weights=None):
+        self.indptr = indptr
+        self.job_ids = job_ids
+        self.n_jobs = n_jobs
+        self.weights = weights
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Build from a (n_jobs x n_terms) sparse matrix; every stored entry is
+        one posting.
+        """
+        csc = matrix.tocsc()
+        csc.sort_indices()
+        return cls(
+            csc.indptr.astype(np.int64), csc.indices.astype(np.int32), matrix.shape[0],
+            csc.data.astype(np.float32),
+        )
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def postings(self, term_id: int):
+        return self.job_ids[self.indptr[term_id]:self.indptr[term_id + 1]]
+
+    def candidates(self, term_ids, min_overlap: int = 1):
+        """
+        Ascending job ids that share at least min_overlap distinct terms
+        with term_ids.
+        """
+        term_ids = np.unique(np.asarray(term_ids, dtype=np.int64))
+        if term_ids.size == 0:
+            return np.zeros(0, dtype=np.int32)
+        lists = [self.postings(t) for t in term_ids.tolist()]
+        hits = np.concatenate(lists)
+        if min_overlap <= 1:
+            return np.unique(hits)
+        jobs, counts = np.unique(hits, return_counts=True)
+        return jobs[counts >= min_overlap]
+
+    def gather(self, term_ids):
+        """
+        Every posting of the given terms in one go, as parallel arrays
+        (query position of the term, job id, posting weight).
+        """
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        starts, stops = self.indptr[term_ids], self.indptr[term_ids + 1]
+        lengths = stops - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return np.repeat(np.arange(len(term_ids)), lengths), self.job_ids[offsets], self.weights[offsets]
+
+    def accumulate(self, term_ids, query_weights, min_overlap: int = 1):
+        """
+        Term-at-a-time scoring: (job_ids, scores) where each score is the
+        sum of query_weights[i] * posting weight over the query terms the
+        job uses, for jobs using at least min_overlap of them. term_ids
+        must be distinct.
+        """
+        which, hits, weights = self.gather(term_ids)
+        values = weights * np.asarray(query_weights, dtype=np.float32)[which]
+        return sum_by_job(hits, values, min_overlap)
+
+
+def sum_by_job(hits, values, min_overlap: int = 1):
+    """
+    (ascending job ids, float32 per-job sums of values) over the postings
+    in hits, keeping jobs hit at least min_overlap times.
+    """
+    if hits.size == 0:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    jobs, inverse, counts = np.unique(hits, return_inverse=True, return_counts=True)
+    scores = np.bincount(inverse, weights=values, minlength=len(jobs)).astype(np.float32)
+    if min_overlap > 1:
+        keep = counts >= min_overlap
+        jobs, scores = jobs[keep], scores[keep]
+    return jobs, scores
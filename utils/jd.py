@@ -0,0 +1,104 @@
+# utils/jd.py
+"""
+Job descriptions compiled once for scoring many resumes against them.
+
+Everything about an ATS comparison that depends only on the job
+description (its keywords and the skills covering them, its skill bitset
+and its TF-IDF vector under the corpus IDF) is computed once into a
+CompiledJD, cached by the hash of the JD text.
+"""
+from utils.cache import memoize_text
+from utils.idf import get_idf_model
+from utils.taxonomy import get_taxonomy
+from utils.tokenizer import is_numeric, tokenized
+
+# '/' usually separates alternatives ("React/Node.js"), so it still splits
+COMPOUND_JOINERS = frozenset(".-")
+
+
+class CompiledJD:
+    """
+    keywords: the JD's distinct terms, in order, as written: tokens of 2+
+    chars that are not numbers, and compounds of tokens joined by a single
+    '.' or '-' ("node.js", "scikit-learn") kept whole
+    keyword_phrases: parallel phrase of each keyword for has_phrase()
+    keyword_masks: parallel skill bitset of each keyword, the skills whose
+    phrases cover it in the JD ("deep" and "learning" in "deep learning")
+    skill_mask: taxonomy bitset of the skills the JD asks for
+    vector: normalized {term: weight} under the corpus IDF
+    taxonomy_version / idf_version: what it was compiled against
+    """
+
+    __slots__ = ("keywords", "keyword_phrases", "keyword_masks", "skill_mask", "vector",
+                 "taxonomy_version", "idf_version")
+
+    def __init__(self, keywords, keyword_phrases, keyword_masks, skill_mask, vector, taxonomy_version, idf_version):
+        self.keywords = keywords
+        self.keyword_phrases = keyword_phrases
+        self.keyword_masks = keyword_masks
+        self.skill_mask = skill_mask
+        self.vector = vector
+        self.taxonomy_version = taxonomy_version
+        self.idf_version = idf_version
+
+
+def _jd_terms(doc):
+    """
+    (as written, phrase, first token, last token) of each term of doc: runs
+    of tokens joined by a single COMPOUND_JOINERS character make one term,
+    other tokens their own.
+    """
+    tokens, gaps = doc.tokens, doc.gaps
+    first = 0
+    for i in range(len(tokens)):
+        if i + 1 < len(tokens) and gaps[i] in COMPOUND_JOINERS:
+            continue
+        if first == i:
+            yield tokens[i], tokens[i], i, i
+        else:
+            yield doc.text[doc.starts[first]:doc.ends[i]], " ".join(tokens[first:i + 1]), first, i
+        first = i + 1
+
+
+# v3: compound keywords and keyword_phrases; older on-disk entries must not load
+@memoize_text("jd.compiled.v3")
+def _compile_jd(job_desc: str, idf_version: str) -> CompiledJD:
+    taxonomy = get_taxonomy()
+    idf = get_idf_model()
+    doc = tokenized(job_desc or "")
+    # one pass over the skill hits gives the JD's skills and which tokens
+    # each one covers
+    skill_mask = 0
+    covered = {}
+    tokens = doc.tokens
+    for skill_id, first, last in taxonomy.matcher.token_hits(doc):
+        bit = 1 << skill_id
+        skill_mask |= bit
+        for token in tokens[first:last + 1]:
+            covered[token] = covered.get(token, 0) | bit
+    # a compound is covered by the skills covering all of its tokens
+    terms = {}
+    for written, phrase, first, last in _jd_terms(doc):
+        if phrase in terms or len(written) < 2 or all(map(is_numeric, tokens[first:last + 1])):
+            continue
+        mask = -1
+        for token in tokens[first:last + 1]:
+            mask &= covered.get(token, 0)
+        terms[phrase] = (written, mask)
+    return CompiledJD(
+        keywords=tuple(written for written, _ in terms.values()),
+        keyword_phrases=tuple(terms),
+        keyword_masks=tuple(mask for _, mask in terms.values()),
+        skill_mask=skill_mask,
+        vector=idf.vector(job_desc),
+        taxonomy_version=taxonomy.version,
+        idf_version=idf_version,
+    )
+
+
+def compile_jd(job_desc: str) -> CompiledJD:
+    """
+    CompiledJD for job_desc, from the extraction cache when this JD (under
+    the current taxonomy and IDF) has been compiled before.
+    """
+    return _compile_jd(job_desc, get_idf_model().version)
@@ -0,0 +1,334 @@
+# utils/job_index.py
+"""
+Prebuilt job index for local job matching.
+
+The TF-IDF vectorizer is fitted on the job catalog once and the
+L2-normalized job matrix kept in memory, so matching a resume is one
+transform plus one sparse matrix-vector product over every job.
+
+JOB_INDEX_MODE=hashed swaps the fitted vocabulary for hashed features
+(HashedJobIndex): a fixed number of buckets and a float32 IDF array, so
+there is no vocabulary dict to fit, pickle or copy into each worker.
+
+save_job_index / load_job_index keep a built index next to the columnar
+catalog, so workers memory-map it instead of refitting at start-up.
+"""
+import json
+import math
+import os
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.utils import murmurhash3_32
+
+from utils.columnar import ColumnarJobs, _read_strings, _strings, write_array, write_json
+from utils.inverted_index import InvertedIndex
+from utils.job_store import JobStore
+from utils.tokenizer import analyze, analyze_uncached
+from utils.vocab import JobKeywords
+
+JOB_INDEX_MODE = os.environ.get("JOB_INDEX_MODE", "tfidf")
+HASH_BUCKETS = int(os.environ.get("HASH_BUCKETS", str(2 ** 18)))
+
+
+def top_k(scores, k: int):
+    """
+    Indices of the k highest scores, best first; ties keep job order (same
+    as a stable sort of everything). Uses a partial selection, so cost is
+    linear in the number of jobs rather than n log n.
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k >= n:
+        return np.lexsort((np.arange(n), -scores))
+    part = np.argpartition(-scores, k - 1)[:k]
+    threshold = scores[part].min()
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    idx = np.concatenate([above, ties])
+    return idx[np.lexsort((idx, -scores[idx]))]
+
+
+def job_document(job: dict) -> str:
+    return " ".join(job.get("keywords", []))
+
+
+def catalog_jobs(jobs):
+    """
+    jobs as an index keeps them: a ColumnarJobs or JobStore by reference
+    (both read jobs on access, and iterating a JobStore fetches iter_jobs()
+    batches), anything else copied into a list.
+    """
+    return jobs if isinstance(jobs, (ColumnarJobs, JobStore)) else list(jobs)
+
+
+class JobIndex:
+    """
+    jobs: the job dicts in index order (a ColumnarJobs or JobStore is kept
+    as it is, see catalog_jobs)
+    vectorizer: TfidfVectorizer fitted on the job documents
+    matrix: CSR float32 (n_jobs x n_terms), rows L2-normalized
+    job_keywords: JobKeywords for matched/missing explanations
+    inverted: InvertedIndex from TF-IDF term id to the jobs using it
+    """
+
+    def __init__(self, jobs):
+        self.jobs = catalog_jobs(jobs)
+        self.job_keywords = JobKeywords(self.jobs)
+        self.vectorizer = TfidfVectorizer(analyzer=analyze_uncached, dtype=np.float32)
+        try:
+            # documents are streamed, never held as a list
+            self.matrix = self.vectorizer.fit_transform(job_document(j) for j in self.jobs).tocsr()
+            self.vocabulary = self.vectorizer.vocabulary_
+            self.idf = self.vectorizer.idf_.astype(np.float32)
+        except ValueError:
+            # empty catalog, or no job has a single keyword
+            self.matrix = None
+            self.vocabulary = {}
+            self.idf = np.zeros(0, dtype=np.float32)
+        self.inverted = InvertedIndex.from_matrix(self.matrix) if self.matrix is not None else None
+        # idf of a term no job uses (smooth_idf, df = 0)
+        self.oov_idf = math.log(1 + len(self.jobs)) + 1
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def column(self, term: str):
+        """
+        Matrix column of term, or None if no job uses it.
+        """
+        return self.vocabulary.get(term)
+
+    def term_weights(self, terms):
+        """
+        ({column: tf-idf weight}, squared norm) for a token sequence; terms
+        no job uses have no column but still count towards the norm, so a
+        resume is not a perfect match just because the few job terms it has
+        line up.
+        """
+        idf = self.idf
+        cols = Counter()
+        sq = 0.0
+        for term, tf in Counter(terms).items():
+            col = self.column(term)
+            if col is None:
+                sq += (tf * self.oov_idf) ** 2
+            else:
+                cols[col] += tf
+        weights = {col: tf * float(idf[col]) for col, tf in cols.items()}
+        sq += sum(w * w for w in weights.values())
+        return weights, sq
+
+    def query_vector(self, text: str):
+        """
+        Dense, L2-normalized TF-IDF vector of text over the job columns,
+        or None if it shares no terms with any job.
+        """
+        weights, sq = self.term_weights(analyze(text or ""))
+        if not weights:
+            return None
+        vec = np.zeros(len(self.idf), dtype=np.float32)
+        vec[list(weights)] = list(weights.values())
+        vec /= math.sqrt(sq)
+        return vec
+
+    def scores(self, text: str):
+        """
+        Cosine similarity (0-100) between text and every job.
+        """
+        q = None if self.matrix is None else self.query_vector(text)
+        if q is None:
+            return np.zeros(len(self.jobs), dtype=np.float32)
+        return (self.matrix @ q) * 100
+
+    def candidate_scores(self, text: str, min_overlap: int = 1):
+        """
+        (job_ids, scores) for only the jobs sharing at least min_overlap
+        terms with text, found through the inverted index; every other job
+        would score 0 (min_overlap=1) or is deliberately skipped.
+        """
+        weights, sq = self.term_weights(analyze(text or "")) if self.matrix is not None else ({}, 0.0)
+        if not weights:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        cols = np.fromiter(weights, dtype=np.int64, count=len(weights))
+        w = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+        w *= 100 / math.sqrt(sq)
+        return self.inverted.accumulate(cols, w, min_overlap)
+
+    def top(self, text: str, k: int, min_overlap: int = 1):
+        """
+        [(job_id, score)] for the k best jobs, best first. min_overlap=0
+        scores every job; 1 (the default) prunes through the inverted index
+        with identical results; higher values also drop weak matches.
+        """
+        if not min_overlap:
+            scores = self.scores(text)
+            return [(j, float(scores[j])) for j in top_k(scores, k).tolist()]
+        candidates, scores = self.candidate_scores(text, min_overlap)
+        picked = [(int(candidates[i]), float(scores[i])) for i in top_k(scores, k).tolist()]
+        if min_overlap == 1 and len(picked) < k:
+            # fewer than k jobs share a term; the rest tie at 0 in job order
+            taken = {j for j, _ in picked}
+            for j in range(len(self.jobs)):
+                if len(picked) >= k:
+                    break
+                if j not in taken:
+                    picked.append((j, 0.0))
+        return picked
+
+
+class HashedJobIndex(JobIndex):
+    """
+    JobIndex over hashed features: term -> murmurhash3 bucket, with the
+    catalog's smoothed IDF per bucket kept as a float32 array. Nothing but
+    the IDF array depends on the catalog, so any process can vectorize
+    (streamed) documents on its own. Hash collisions merge terms, which with
+    the default 2**18 buckets rarely changes a ranking.
+    """
+
+    def __init__(self, jobs, n_buckets: int = HASH_BUCKETS):
+        self.jobs = catalog_jobs(jobs)
+        self.n_buckets = n_buckets
+        self.job_keywords = JobKeywords(self.jobs)
+        self.vectorizer = None
+        self.vocabulary = None
+        n_jobs = len(self.jobs)
+        indptr, indices, counts = [0], [], []
+        for job in self.jobs:
+            buckets = Counter(map(self.bucket, analyze_uncached(job_document(job))))
+            indices.extend(buckets)
+            counts.extend(buckets.values())
+            indptr.append(len(indices))
+        indices = np.asarray(indices, dtype=np.int32)
+        df = np.bincount(indices, minlength=n_buckets)
+        self.idf = (np.log((1 + n_jobs) / (1 + df)) + 1).astype(np.float32)
+        self.oov_idf = math.log(1 + n_jobs) + 1
+        # buckets some job uses; the others behave like out-of-vocabulary terms
+        self.used = df > 0
+        if len(indices):
+            matrix = sparse.csr_matrix(
+                (np.asarray(counts, dtype=np.float32) * self.idf[indices], indices, np.asarray(indptr, dtype=np.int64)),
+                shape=(n_jobs, n_buckets),
+            )
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            self.matrix = sparse.diags(1 / norms).astype(np.float32) @ matrix
+            self.matrix.sort_indices()
+            self.inverted = InvertedIndex.from_matrix(self.matrix)
+        else:
+            self.matrix = None
+            self.inverted = None
+
+    def bucket(self, term: str) -> int:
+        return murmurhash3_32(term, positive=True) % self.n_buckets
+
+    def column(self, term: str):
+        col = self.bucket(term)
+        return col if self.used[col] else None
+
+
+def build_job_index(jobs, mode: str = None):
+    """
+    JobIndex for jobs in the configured mode (JOB_INDEX_MODE: tfidf or hashed).
+    """
+    mode = mode or JOB_INDEX_MODE
+    if mode == "hashed":
+        return HashedJobIndex(jobs)
+    if mode != "tfidf":
+        raise ValueError(f"unknown JOB_INDEX_MODE: {mode!r}")
+    return JobIndex(jobs)
+
+
+def save_job_index(index, path: str, version: str):
+    """
+    Write a JobIndex / HashedJobIndex for the catalog version as
+    index.<array>.<version>.npy plus index.json (last), and remove the
+    index files of other versions.
+    """
+    hashed = isinstance(index, HashedJobIndex)
+    arrays = {"idf": index.idf}
+    if index.matrix is not None:
+        arrays.update(
+            matrix_data=index.matrix.data, matrix_indices=index.matrix.indices, matrix_indptr=index.matrix.indptr,
+            inverted_indptr=index.inverted.indptr, inverted_job_ids=index.inverted.job_ids,
+            inverted_weights=index.inverted.weights,
+        )
+    if hashed:
+        arrays["used"] = index.used
+    else:
+        # fitted terms in column order
+        terms = [None] * len(index.vocabulary)
+        for term, col in index.vocabulary.items():
+            terms[col] = term
+        arrays["term_bytes"], arrays["term_offsets"] = _strings(terms)
+    written = set()
+    for name, values in arrays.items():
+        filename = f"index.{name}.{version}.npy"
+        write_array(path, filename, values)
+        written.add(filename)
+    meta = {
+        "version": version, "mode": "hashed" if hashed else "tfidf", "arrays": sorted(arrays),
+        "n_jobs": len(index), "n_columns": len(index.idf), "oov_idf": index.oov_idf,
+        "n_buckets": index.n_buckets if hashed else None,
+    }
+    write_json(path, "index.json", meta)
+    for filename in os.listdir(path):
+        if filename.startswith("index.") and filename.endswith(".npy") and filename not in written:
+            os.remove(os.path.join(path, filename))
+
+
+def load_job_index(path: str, jobs, mode: str = None):
+    """
+    The index saved by save_job_index for exactly this catalog (jobs is
+    the ColumnarJobs loaded from path) and mode, with its arrays
+    memory-mapped; None if there is none, in which case build one.
+    """
+    mode = mode or JOB_INDEX_MODE
+    try:
+        with open(os.path.join(path, "index.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta["version"] != jobs.version or meta["mode"] != mode or meta["n_jobs"] != len(jobs):
+        return None
+    if mode == "hashed" and meta["n_buckets"] != HASH_BUCKETS:
+        return None
+    version = meta["version"]
+    try:
+        arrays = {
+            name: np.load(os.path.join(path, f"index.{name}.{version}.npy"), mmap_mode="r")
+            for name in meta["arrays"]
+        }
+    except OSError:
+        # replaced by a newer build meanwhile
+        return None
+    cls = HashedJobIndex if mode == "hashed" else JobIndex
+    index = cls.__new__(cls)
+    index.jobs = jobs
+    index.job_keywords = JobKeywords(jobs)
+    index.vectorizer = None
+    index.idf = arrays["idf"]
+    index.oov_idf = meta["oov_idf"]
+    n_jobs = meta["n_jobs"]
+    if "matrix_data" in arrays:
+        index.matrix = sparse.csr_matrix(
+            (arrays["matrix_data"], arrays["matrix_indices"], arrays["matrix_indptr"]),
+            shape=(n_jobs, meta["n_columns"]),
+        )
+        index.inverted = InvertedIndex(
+            arrays["inverted_indptr"], arrays["inverted_job_ids"], n_jobs, arrays["inverted_weights"],
+        )
+    else:
+        index.matrix = None
+        index.inverted = None
+    if mode == "hashed":
+        index.n_buckets = meta["n_buckets"]
+        index.used = arrays["used"]
+        index.vocabulary = None
+    else:
+        terms = _read_strings(arrays["term_bytes"], arrays["term_offsets"])
+        index.vocabulary = {term: col for col, term in enumerate(terms)}
+    return index
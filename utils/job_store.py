@@ -0,0 +1,233 @@
+# utils/job_store.py
+"""
+SQLite job store with an FTS5 index on title and keywords.
+
+The catalog lives in one database file that workers open read-only, so
+every process shares it through the OS page cache instead of holding its
+own parsed copy of jobs.json. Build or refresh it with
+
+    python -m utils.job_store import jobs.json feed.jsonl --db jobs.db
+
+A JobStore reads like a list of job dicts (len, iteration, indexing), so
+it can be handed to JobIndex / score_against_jobs as it is. Importing
+rebuilds the columnar catalog if it was built from the same store.
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from utils.columnar import refresh_columns
+from utils.tokenizer import tokenized
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOB_STORE_PATH = os.environ.get("JOB_STORE_PATH", os.path.join(BASE_DIR, "jobs.db"))
+IMPORT_BATCH = 5000
+# cap on distinct resume terms in a full-text query
+SEARCH_TERMS = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    extra TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, keywords, content='jobs', content_rowid='id',
+    tokenize="unicode61 tokenchars '+#'"
+);
+"""
+
+
+def _row_to_job(row):
+    job = json.loads(row[2]) if row[2] else {}
+    job["title"] = row[0]
+    job["keywords"] = json.loads(row[1])
+    return job
+
+
+class JobStore:
+    """
+    Read-only view of a job database. Job i (0-based, as used by JobIndex)
+    is row id i + 1; the importer keeps ids contiguous. Connections are per
+    thread.
+    """
+
+    def __init__(self, path: str = JOB_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._len = self._conn().execute("SELECT count(*) FROM jobs").fetchone()[0]
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            # map the file so pages are shared between workers
+            conn.execute("PRAGMA mmap_size = 1073741824")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i: int):
+        if i < 0:
+            i += self._len
+        row = self._conn().execute(
+            "SELECT title, keywords, extra FROM jobs WHERE id = ?", (i + 1,)
+        ).fetchone()
+        if row is None:
+            raise IndexError(i)
+        return _row_to_job(row)
+
+    def __iter__(self):
+        return self.iter_jobs()
+
+    def iter_jobs(self, batch: int = IMPORT_BATCH):
+        """
+        Every job in id order, fetched batch rows at a time.
+        """
+        cursor = self._conn().execute("SELECT title, keywords, extra FROM jobs WHERE id <= ? ORDER BY id", (self._len,))
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                break
+            for row in rows:
+                yield _row_to_job(row)
+
+    def search(self, text: str, limit: int = 50):
+        """
+        [(job index, job)] for the jobs whose title or keywords best match
+        the terms of text (FTS5 bm25 order), at most limit of them.
+        """
+        terms = list(dict.fromkeys(t for t in tokenized(text or "").tokens if len(t) > 1))[:SEARCH_TERMS]
+        if not terms:
+            return []
+        query = " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        rows = self._conn().execute(
+            "SELECT j.id, j.title, j.keywords, j.extra FROM jobs_fts f JOIN jobs j ON j.id = f.rowid "
+            "WHERE jobs_fts MATCH ? AND j.id <= ? ORDER BY bm25(jobs_fts) LIMIT ?",
+            (query, self._len, limit),
+        ).fetchall()
+        return [(row[0] - 1, _row_to_job(row[1:])) for row in rows]
+
+
+def iter_feed(path: str):
+    """
+    Jobs from a .json array (loaded whole) or a .jsonl feed (streamed).
+    Feed lines that are not JSON objects are logged and skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for lineno, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    job = json.loads(line)
+                except ValueError as e:
+                    logger.warning("%s: skipping bad line %d: %s", path, lineno, e)
+                    continue
+                if not isinstance(job, dict):
+                    logger.warning("%s: skipping line %d, not a JSON object", path, lineno)
+                    continue
+                yield job
+        else:
+            yield from json.load(f)
+
+
+def _job_row(job: dict):
+    extra = {k: v for k, v in job.items() if k not in ("title", "keywords")}
+    return (
+        job.get("title") or "",
+        json.dumps(list(job.get("keywords", [])), ensure_ascii=False),
+        json.dumps(extra, ensure_ascii=False) if extra else None,
+    )
+
+
+def connect_writable(db_path: str):
+    """
+    Read-write connection to db_path, creating the schema if needed.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def append_jobs(conn, jobs):
+    """
+    Insert job dicts after the last row, keeping ids contiguous, and index
+    them for full-text search. Runs inside the caller's transaction.
+    Returns the number inserted.
+    """
+    rows = [_job_row(job) for job in jobs]
+    start = conn.execute("SELECT coalesce(max(id), 0) FROM jobs").fetchone()[0] + 1
+    numbered = [(start + i,) + row for i, row in enumerate(rows)]
+    conn.executemany("INSERT INTO jobs (id, title, keywords, extra) VALUES (?, ?, ?, ?)", numbered)
+    conn.executemany(
+        "INSERT INTO jobs_fts (rowid, title, keywords) VALUES (?, ?, ?)",
+        [(n[0], n[1], ", ".join(json.loads(n[2]))) for n in numbered],
+    )
+    return len(rows)
+
+
+def import_jobs(db_path: str, sources, append: bool = False, batch: int = IMPORT_BATCH):
+    """
+    Load jobs from the source files into db_path. Without append the
+    database is built in a temporary file and moved into place, so readers
+    never see a half-written catalog (open JobStores keep the old file).
+    Returns the number of jobs imported.
+    """
+    target = db_path
+    if not append:
+        fd, target = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(db_path)) or ".", suffix=".db")
+        os.close(fd)
+    conn = connect_writable(target)
+    try:
+        count = 0
+        jobs = []
+        for path in sources:
+            for job in iter_feed(path):
+                jobs.append(job)
+                if len(jobs) >= batch:
+                    with conn:
+                        count += append_jobs(conn, jobs)
+                    jobs = []
+        if jobs:
+            with conn:
+                count += append_jobs(conn, jobs)
+        conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('optimize')")
+        conn.commit()
+    finally:
+        conn.close()
+    if not append:
+        os.replace(target, db_path)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import jobs into the SQLite job store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import")
+    imp.add_argument("sources", nargs="+", help="jobs.json arrays and/or .jsonl feeds")
+    imp.add_argument("--db", default=JOB_STORE_PATH)
+    imp.add_argument("--append", action="store_true", help="add to the existing database in place")
+    args = parser.parse_args(argv)
+    t0 = time.perf_counter()
+    count = import_jobs(args.db, args.sources, append=args.append)
+    elapsed = time.perf_counter() - t0
+    print(f"imported {count} jobs into {args.db} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f} jobs/s)")
+    columns = refresh_columns(args.db)
+    if columns is not None:
+        print(f"rebuilt the columnar catalog: {len(columns)} jobs")
+
+
+if __name__ == "__main__":
+    main()
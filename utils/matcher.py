@@ -0,0 +1,177 @@
+# utils/matcher.py
+"""
+Multi-pattern skill matcher.
+
+Every skill and alias is compiled once into a phrase table keyed by its
+tokens, and all skills in a document are then found from the document's
+shared TokenizedDoc in one pass: a set lookup for one-token skills, plus a
+few n-gram probes where a token can start a longer one. Matching follows
+the tokenizer's rules exactly (whole tokens, joined by whitespace or a
+single '.', '-' or '/'), so every caller sees the same skills.
+"""
+from array import array
+from collections import Counter
+
+from utils.tokenizer import tokenize
+
+
+class MatchIndex:
+    """
+    Character offsets of every skill hit in one document, stored as two
+    parallel uint32 arrays (starts, ends) per skill id.
+    """
+
+    __slots__ = ("_spans",)
+
+    def __init__(self):
+        self._spans = {}
+
+    def add(self, skill_id: int, start: int, end: int):
+        spans = self._spans.get(skill_id)
+        if spans is None:
+            spans = self._spans[skill_id] = (array("I"), array("I"))
+        spans[0].append(start)
+        spans[1].append(end)
+
+    def __contains__(self, skill_id):
+        return skill_id in self._spans
+
+    def __iter__(self):
+        return iter(self._spans)
+
+    def __len__(self):
+        return len(self._spans)
+
+    def spans(self, skill_id: int):
+        """
+        List of (start, end) offsets for skill_id, in text order.
+        """
+        starts, ends = self._spans.get(skill_id, ((), ()))
+        return list(zip(starts, ends))
+
+    def snippet(self, text: str, skill_id: int, width: int = 40):
+        """
+        Context around the first hit of skill_id, or "" if it never matched.
+        """
+        spans = self._spans.get(skill_id)
+        if not spans:
+            return ""
+        start, end = spans[0][0], spans[1][0]
+        lo, hi = max(0, start - width), min(len(text), end + width)
+        snippet = " ".join(text[lo:hi].split())
+        return ("..." if lo else "") + snippet + ("..." if hi < len(text) else "")
+
+
+class SkillMatcher:
+    """
+    Phrase table over a fixed set of skills: {phrase key: skill id}, where
+    the key is the surface form's tokens joined by single spaces
+    ("Node.js" -> "node js"), so "java" never matches inside "javascript"
+    and "python" is found in "Python/Django".
+    """
+
+    def __init__(self, skills, aliases=None):
+        # skill ids follow the order skills are given in; aliases map extra
+        # surface forms onto the id of their canonical skill
+        self.skills = tuple(dict.fromkeys(
+            s.strip().lower() for s in skills if s and s.strip()
+        ))
+        ids = {skill: skill_id for skill_id, skill in enumerate(self.skills)}
+        self.phrases = {}
+        for skill, skill_id in ids.items():
+            self._add(skill, skill_id)
+        for alias, canonical in (aliases or {}).items():
+            alias = alias.strip().lower()
+            skill_id = ids.get(canonical.strip().lower())
+            if alias and skill_id is not None and alias not in ids:
+                self._add(alias, skill_id)
+        # first token -> most tokens of a phrase starting with it
+        self.heads = {}
+        for phrase in self.phrases:
+            n = phrase.count(" ") + 1
+            if n > 1:
+                head = phrase.split(" ", 1)[0]
+                self.heads[head] = max(self.heads.get(head, 0), n)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _add(self, surface: str, skill_id: int):
+        key = " ".join(tokenize(surface).tokens)
+        if key:
+            self.phrases.setdefault(key, skill_id)
+
+    def _longer(self, doc, i: int):
+        """
+        Yield (skill_id, end token index) of the multi-token phrases
+        starting at token i.
+        """
+        phrases = self.phrases
+        for n in range(2, self.heads[doc.tokens[i]] + 1):
+            gram = doc.gram(i, n)
+            if gram is None:
+                return
+            skill_id = phrases.get(gram)
+            if skill_id is not None:
+                yield skill_id, i + n - 1
+
+    def token_hits(self, doc):
+        """
+        Yield (skill_id, first token, last token) for every hit in a
+        TokenizedDoc, in text order.
+        """
+        phrases, heads = self.phrases, self.heads
+        for i, token in enumerate(doc.tokens):
+            skill_id = phrases.get(token)
+            if skill_id is not None:
+                yield skill_id, i, i
+            if token in heads:
+                for skill_id, last in self._longer(doc, i):
+                    yield skill_id, i, last
+
+    def scan(self, doc):
+        """
+        Yield (skill_id, start, end) character offsets for every hit in a
+        TokenizedDoc, in text order.
+        """
+        starts, ends = doc.starts, doc.ends
+        for skill_id, first, last in self.token_hits(doc):
+            yield skill_id, starts[first], ends[last]
+
+    def count_ids(self, doc):
+        """
+        {skill_id: occurrences} in a TokenizedDoc without tracking offsets:
+        tokens are counted in C and only the positions of tokens that start
+        a longer phrase are revisited. Same hits as scan().
+        """
+        phrases = self.phrases
+        counts = {}
+        tokens = Counter(doc.tokens)
+        for token, freq in tokens.items():
+            skill_id = phrases.get(token)
+            if skill_id is not None:
+                counts[skill_id] = counts.get(skill_id, 0) + freq
+        positions = None
+        for head in self.heads.keys() & tokens.keys():
+            if positions is None:
+                positions = doc.positions
+            for i in positions[head]:
+                for skill_id, _ in self._longer(doc, i):
+                    counts[skill_id] = counts.get(skill_id, 0) + 1
+        return counts
+
+    def index(self, doc):
+        """
+        MatchIndex of every hit in a TokenizedDoc.
+        """
+        index = MatchIndex()
+        for skill_id, start, end in self.scan(doc):
+            index.add(skill_id, start, end)
+        return index
+
+    def find(self, doc):
+        """
+        Set of skills present in a TokenizedDoc.
+        """
+        skills = self.skills
+        return {skills[skill_id] for skill_id in self.count_ids(doc)}
@@ -1,6 +1,11 @@
 import os
 import requests
 import re
+from itertools import islice
+
+from utils.cache import memoize_text
+from utils.taxonomy import get_taxonomy
+from utils.tokenizer import tokenized
 
 HF_API_TOKEN = os.environ.get("HF_API_TOKEN")  # put your Hugging Face token here
 
@@ -62,38 +67,44 @@ def call_hf_keyphrase_model(text: str, max_keywords: int = 20):
         return []
 
 
-# fallback simple extractor: words 3+ chars, common skill tokens
-COMMON_SKILLS = [
-    "python","java","c++","c","javascript","react","angular","nodejs","sql","mysql","postgresql",
-    "mongodb","tensorflow","pytorch","machine learning","deep learning","nlp","computer vision",
-    "pandas","numpy","scikit-learn","aws","azure","docker","kubernetes","git","html","css","bootstrap",
-    "rest","api","flask","django","linux"
-]
+# fallback simple extractor: taxonomy skills (see skills.json), then
+# tech-like tokens of 3+ chars
+# too generic to be worth reporting
+_GENERIC_WORDS = frozenset(("the", "and", "for", "with", "this", "that", "from"))
+
+
+def iter_skill_keywords(text: str):
+    """
+    Lazily yield unique skill keywords from text: known skills first
+    (canonicalized, in taxonomy order), then tech-like tokens in the order
+    they appear. Taxonomy order needs every skill, so the whole text is
+    tokenized and matched before the first yield; stopping early only
+    skips the per-token work on the remaining tokens.
+    """
+    taxonomy = get_taxonomy()
+    doc = tokenized(text)
+    seen = set()
+    for skill_id in sorted(taxonomy.doc_skill_ids(doc)):
+        skill = taxonomy.skills[skill_id]
+        seen.add(skill)
+        yield skill
+    for tl in doc.tokens:
+        if len(tl) < 3:
+            continue
+        tl = taxonomy.canonical(tl) or tl
+        if tl in seen or tl in _GENERIC_WORDS:
+            continue
+        seen.add(tl)
+        yield tl
+
 
+@memoize_text("nlp.simple_skills")
 def simple_skill_extractor(text: str, max_keywords: int = 30):
     """
     Basic skill extractor: find occurrences of common skills and return a list.
     Also extracts capitalized tokens and tech-like tokens.
     """
-    text_lower = text.lower()
-    found = []
-    # check common list
-    for skill in COMMON_SKILLS:
-        if skill in text_lower and skill not in found:
-            found.append(skill)
-            if len(found) >= max_keywords:
-                return found
-
-    # extract tokens that look like tech words (alphanumeric, len>=3)
-    tokens = re.findall(r"\b[a-zA-Z0-9\+\#\.\-]{3,}\b", text)
-    for t in tokens:
-        tl = t.lower()
-        if tl not in found and len(found) < max_keywords:
-            # ignore too generic words
-            if tl in ("the","and","for","with","this","that","from"):
-                continue
-            found.append(tl)
-    return found[:max_keywords]
+    return list(islice(iter_skill_keywords(text or ""), max(0, max_keywords)))
 
 
 def extract_skills_from_text(text: str, max_keywords: int = 30):
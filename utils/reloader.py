@@ -0,0 +1,116 @@
+# utils/reloader.py
+"""
+File-backed resource that is rebuilt in the background when the file changes.
+"""
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _file_mtime(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ReloadingResource:
+    """
+    Holds the value built by loader(path) and swaps in a fresh one when the
+    file's mtime changes, or that of any file in watch (files the value is
+    derived from, which may not exist yet).
+
+    get() never builds anything itself: at most once per poll_interval it
+    compares the mtime and, if the file changed, starts a background thread
+    that builds the new value and replaces the reference in one assignment.
+    Callers that already hold the old value keep using it undisturbed.
+    Polling on access (rather than a watcher thread) keeps this working in
+    forked gunicorn workers, where threads started before the fork are gone.
+    Reload counts and build durations are kept for stats().
+    """
+
+    def __init__(self, path: str, loader, poll_interval: float = 2.0, watch=()):
+        self.path = path
+        self.watch = tuple(watch)
+        self.poll_interval = poll_interval
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._reloading = False
+        self.reloads = 0
+        self.reload_failures = 0
+        self.last_reload_seconds = None
+        self.total_reload_seconds = 0.0
+        self._mtime = self._stamp()
+        t0 = time.perf_counter()
+        self._value = loader(path)
+        self.load_seconds = time.perf_counter() - t0
+        self._next_check = time.monotonic() + poll_interval
+
+    def get(self):
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.poll_interval
+            self._maybe_reload()
+        return self._value
+
+    def _stamp(self):
+        if not self.watch:
+            return _file_mtime(self.path)
+        return tuple(_file_mtime(path) for path in (self.path,) + self.watch)
+
+    def _maybe_reload(self):
+        mtime = self._stamp()
+        if mtime is None or mtime == self._mtime:
+            return
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, args=(mtime,), daemon=True).start()
+
+    def _reload(self, mtime):
+        t0 = time.perf_counter()
+        try:
+            value = self._loader(self.path)
+        except Exception as e:
+            # keep serving the previous value; retry once the file changes again
+            logger.error("reload of %s failed: %s", self.path, e)
+            self.reload_failures += 1
+        else:
+            self._value = value
+            self.reloads += 1
+        finally:
+            self._record(time.perf_counter() - t0)
+            self._mtime = mtime
+            self._reloading = False
+
+    def _record(self, seconds: float):
+        self.last_reload_seconds = seconds
+        self.total_reload_seconds += seconds
+        logger.info("reloaded %s in %.3fs", self.path, seconds)
+
+    def reload_now(self):
+        """
+        Rebuild synchronously (for CLI tools and tests).
+        """
+        mtime = self._stamp()
+        t0 = time.perf_counter()
+        self._value = self._loader(self.path)
+        self.reloads += 1
+        self._record(time.perf_counter() - t0)
+        self._mtime = mtime
+        return self._value
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "load_seconds": round(self.load_seconds, 4),
+            "reloads": self.reloads,
+            "reload_failures": self.reload_failures,
+            "reloading": self._reloading,
+            "last_reload_seconds": None if self.last_reload_seconds is None else round(self.last_reload_seconds, 4),
+            "total_reload_seconds": round(self.total_reload_seconds, 4),
+        }
@@ -1,36 +1,85 @@
 # utils/local_scorer.py
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import re
+from utils.ann import LSHIndex
+from utils.bm25 import BM25_B, BM25_K1, BM25Index
+from utils.cache import memoize_text
+from utils.idf import cosine, get_idf_model
+from utils.jd import CompiledJD, compile_jd
+from utils.job_index import JobIndex, build_job_index
+from utils.taxonomy import get_taxonomy
+from utils.tokenizer import is_numeric, tokenized
 
-def score_against_jobs(resume_text: str, jobs_db: list, top_n: int = 6):
+# last catalog list -> JobIndex, for callers that pass plain job lists
+_index_cache = None
+
+
+def job_index_for(jobs_db):
+    """
+    JobIndex for jobs_db, built once and reused while the same list is
+    passed again. Long-lived callers should build their own JobIndex.
+    """
+    global _index_cache
+    if isinstance(jobs_db, (JobIndex, LSHIndex)):
+        return jobs_db
+    cached = _index_cache
+    if cached is not None and cached[0] is jobs_db and cached[1] == len(jobs_db):
+        return cached[2]
+    index = build_job_index(jobs_db)
+    _index_cache = (jobs_db, len(jobs_db), index)
+    return index
+
+
+def score_against_jobs(resume_text: str, jobs_db, top_n: int = 6, min_overlap: int = 1):
     """
     Simple local job matching:
-      - For each job, compute TF-IDF similarity between resume_text and job keywords string.
+      - TF-IDF cosine similarity between resume_text and every job's keywords,
+        computed as one sparse matrix-vector product against a prebuilt index.
       - Also compute matched and missing keywords by presence.
+    jobs_db is a list of job dicts, a prebuilt JobIndex, or an LSHIndex
+    (approximate: only its candidates are scored). Only jobs sharing
+    at least min_overlap terms with the resume are scored (0 = score all).
     Returns list of dicts: {title, score, matched, missing, job_keywords}
     """
-    resume_lower = (resume_text or "").lower()
-    results = []
-    # prepare job documents
-    job_docs = [" ".join(job.get("keywords", [])) for job in jobs_db]
-    try:
-        vectorizer = TfidfVectorizer().fit([resume_text] + job_docs)
-        resume_vec = vectorizer.transform([resume_text])
-    except Exception:
-        vectorizer = None
-        resume_vec = None
+    index = job_index_for(jobs_db)
+    return _explain_matches(index, resume_text, index.top(resume_text, top_n, min_overlap))
+
+
+def score_against_jobs_bm25(resume_text: str, index: BM25Index, top_n: int = 6,
+                            k1: float = BM25_K1, b: float = BM25_B):
+    """
+    Same results as score_against_jobs, ranked by BM25 over a prebuilt
+    BM25Index instead of TF-IDF cosine; k1 and b may be tuned per call.
+    """
+    return _explain_matches(index, resume_text, index.top(resume_text, top_n, k1, b))
+
 
-    for job in jobs_db:
+def _explain_matches(index, resume_text: str, picked):
+    """
+    Result dicts for [(job_id, score)]: presence-based matched/missing
+    keywords of each picked job.
+    """
+    resume_doc = tokenized(resume_text or "")
+    taxonomy = get_taxonomy()
+    # skills the resume names or implies ("django" implies "python")
+    implied = taxonomy.implied_skills(taxonomy.extract_doc(resume_doc))
+    # job keywords interned to ids: only the picked jobs' keywords are
+    # checked, each distinct one once (as whole tokens, a set lookup)
+    job_keywords = index.job_keywords
+    terms, phrases = job_keywords.vocab.terms, job_keywords.phrases
+    present = {}
+    # explanations only for the jobs that make the cut
+    results = []
+    for j, score in picked:
+        job = index.jobs[j]
         keywords = job.get("keywords", [])
-        job_text = " ".join(keywords)
-        score = 0.0
-        if vectorizer:
-            job_vec = vectorizer.transform([job_text])
-            score = cosine_similarity(resume_vec, job_vec)[0][0] * 100
         # presence-based matched/missing
-        matched = [k for k in keywords if k.lower() in resume_lower]
-        missing = [k for k in keywords if k.lower() not in resume_lower]
+        hits = []
+        for t in job_keywords.job_term_ids(j).tolist():
+            hit = present.get(t)
+            if hit is None:
+                hit = present[t] = resume_doc.has_phrase(phrases[t]) or taxonomy.canonical(terms[t]) in implied
+            hits.append(hit)
+        matched = [k for k, p in zip(keywords, hits) if p]
+        missing = [k for k, p in zip(keywords, hits) if not p]
         results.append({
             "title": job.get("title"),
             "score": round(score, 2),
@@ -38,51 +87,63 @@ def score_against_jobs(resume_text: str, jobs_db: list, top_n: int = 6):
             "missing": missing,
             "job_keywords": keywords
         })
-    # sort by score
-    results = sorted(results, key=lambda x: x["score"], reverse=True)
-    return results[:top_n]
+    return results
 
+@memoize_text("scorer.keywords")
 def extract_keywords_from_text(text: str):
-    # simple token extractor for ATS
-    tokens = re.findall(r"\b[a-zA-Z\+\#\.\-]{2,}\b", text.lower())
-    seen = set()
-    out = []
-    for t in tokens:
+    # simple token extractor for ATS: taxonomy skills first (aliases mapped
+    # to their canonical name), then the remaining free tokens
+    taxonomy = get_taxonomy()
+    doc = tokenized(text or "")
+    out = [taxonomy.skills[i] for i in sorted(taxonomy.doc_skill_ids(doc))]
+    seen = set(out)
+    for t in doc.tokens:
+        if len(t) < 2 or is_numeric(t):
+            continue
+        t = taxonomy.canonical(t) or t
         if t not in seen and len(t) > 1:
             seen.add(t)
             out.append(t)
         if len(out) >= 200:
             break
-    return out
+    return out[:200]
 
 def ats_score_local(resume_text: str, job_desc: str):
     """
     Basic ATS-like scoring: uses keyword overlap + TF-IDF similarity
     Returns dict: {ats_score, matched_keywords, missing_keywords, suggestions}
     """
-    resume_lower = (resume_text or "").lower()
-    # extract candidate keywords from job_desc (split by common separators)
-    # and also pick known tokens
-    jd_keywords = re.findall(r"[a-zA-Z\+\#\.\-]{2,}", job_desc.lower())
-    # make unique preserving order
-    jd_unique = []
-    seen = set()
-    for k in jd_keywords:
-        if k not in seen:
-            seen.add(k)
-            jd_unique.append(k)
-    # presence
-    matched = [k for k in jd_unique if k in resume_lower]
-    missing = [k for k in jd_unique if k not in resume_lower]
-    # tfidf similarity
-    try:
-        vectorizer = TfidfVectorizer().fit([resume_text, job_desc])
-        vecs = vectorizer.transform([resume_text, job_desc])
-        sim = cosine_similarity(vecs[0], vecs[1])[0][0] * 100
-    except Exception:
-        sim = 0.0
+    return ats_score_compiled(resume_text, compile_jd(job_desc))
+
+
+def ats_score_many(resume_texts, job_desc: str):
+    """
+    ats_score_local for many resumes against one job description, which is
+    compiled once. Yields one result per resume, in order.
+    """
+    jd = compile_jd(job_desc)
+    for resume_text in resume_texts:
+        yield ats_score_compiled(resume_text, jd)
+
+
+def ats_score_compiled(resume_text: str, jd: CompiledJD):
+    """
+    ats_score_local against a CompiledJD; only the resume side is computed.
+    """
+    resume_doc = tokenized(resume_text or "")
+    # presence as whole tokens ("node.js" is "node js", also written
+    # "Node JS"); a JD keyword is also covered when a skill phrase containing
+    # it is named or implied by the resume ("pytorch" covers "deep" and
+    # "learning" of "deep learning")
+    taxonomy = get_taxonomy()
+    implied = taxonomy.expand(taxonomy.doc_mask(resume_doc))
+    present = [resume_doc.has_phrase(p) or bool(m & implied) for p, m in zip(jd.keyword_phrases, jd.keyword_masks)]
+    matched = [k for k, p in zip(jd.keywords, present) if p]
+    missing = [k for k, p in zip(jd.keywords, present) if not p]
+    # tfidf similarity under the corpus idf
+    sim = cosine(get_idf_model().vector(resume_text), jd.vector) * 100
     # combine
-    presence_frac = len(matched) / max(1, len(jd_unique))
+    presence_frac = len(matched) / max(1, len(jd.keywords))
     final_score = 0.6 * sim + 0.4 * presence_frac * 100
     final_score = round(max(0, min(100, final_score)), 2)
     suggestions = []
@@ -0,0 +1,253 @@
+# utils/taxonomy.py
+"""
+Skill taxonomy: canonical skills plus aliases, loaded from skills.json.
+
+The file is compiled once into an immutable Taxonomy (alias lookup + shared
+SkillMatcher, which finds skills in the shared tokenizer's output). get_taxonomy() hands out the current snapshot and swaps in a
+rebuilt one in the background when the file changes on disk.
+"""
+import hashlib
+import json
+import os
+import threading
+from types import MappingProxyType
+
+from utils.fuzzy import FuzzyIndex
+from utils.matcher import SkillMatcher
+from utils.reloader import ReloadingResource
+from utils.tokenizer import tokenized
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TAXONOMY_PATH = os.environ.get("SKILLS_PATH", os.path.join(BASE_DIR, "skills.json"))
+TAXONOMY_POLL_SECONDS = float(os.environ.get("SKILLS_POLL_SECONDS", "2"))
+# also accept skills within a small edit distance ("Kubernates")
+FUZZY_SKILLS = os.environ.get("SKILLS_FUZZY", "0").lower() in ("1", "true", "yes")
+
+
+class Taxonomy:
+    """
+    Immutable compiled taxonomy. Never mutate one in place; build a new one.
+    """
+
+    __slots__ = ("skills", "index", "aliases", "matcher", "fuzzy", "closure", "version")
+
+    def __init__(self, entries):
+        entries = list(entries)
+        skills = []
+        aliases = {}
+        implies = {}
+        for entry in entries:
+            name = (entry.get("name") or "").strip().lower()
+            if not name:
+                continue
+            skills.append(name)
+            implies[name] = [i.strip().lower() for i in entry.get("implies", [])]
+            for alias in entry.get("aliases", []):
+                alias = alias.strip().lower()
+                if alias and alias != name:
+                    aliases[alias] = name
+        matcher = SkillMatcher(skills, aliases)
+        object.__setattr__(self, "skills", matcher.skills)
+        object.__setattr__(self, "index", MappingProxyType(
+            {skill: skill_id for skill_id, skill in enumerate(matcher.skills)}
+        ))
+        object.__setattr__(self, "aliases", MappingProxyType(aliases))
+        object.__setattr__(self, "matcher", matcher)
+        surfaces = dict(self.index)
+        surfaces.update((alias, self.index[name]) for alias, name in aliases.items())
+        object.__setattr__(self, "fuzzy", FuzzyIndex(surfaces))
+        object.__setattr__(self, "closure", _transitive_closure(self.skills, self.index, implies))
+        # content hash; lets caches keyed on extraction results outlive a
+        # reload of an unchanged file (and a worker restart)
+        object.__setattr__(self, "version", hashlib.sha1(
+            json.dumps(entries, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Taxonomy is immutable")
+
+    def __len__(self):
+        return len(self.skills)
+
+    def canonical(self, term: str):
+        """
+        Map a skill or alias to its canonical name; None if unknown.
+        """
+        term = (term or "").strip().lower()
+        if term in self.index:
+            return term
+        return self.aliases.get(term)
+
+    def mask(self, skills):
+        """
+        Bitset (int) of skill ids for canonical skill names; unknown names
+        are ignored.
+        """
+        index = self.index
+        out = 0
+        for skill in skills:
+            skill_id = index.get(skill)
+            if skill_id is not None:
+                out |= 1 << skill_id
+        return out
+
+    def names(self, mask: int):
+        """
+        Canonical skill names whose bits are set in mask, in taxonomy order.
+        """
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(self.skills[low.bit_length() - 1])
+            mask ^= low
+        return out
+
+    def expand(self, mask: int):
+        """
+        mask plus every skill it implies ("pytorch" -> "deep learning" ->
+        "machine learning"): one OR of a precomputed closure per set bit.
+        """
+        closure = self.closure
+        out = mask
+        while mask:
+            low = mask & -mask
+            out |= closure[low.bit_length() - 1]
+            mask ^= low
+        return out
+
+    def implied_skills(self, skills):
+        """
+        Set of canonical skills credited for skills, implications included.
+        """
+        return set(self.names(self.expand(self.mask(skills))))
+
+    def extract(self, text: str, fuzzy: bool = False):
+        """
+        Return the set of canonical skills mentioned in text; with fuzzy,
+        misspelled or split skills count too.
+        """
+        doc = tokenized(text or "")
+        found = self.extract_doc(doc)
+        if fuzzy:
+            found.update(self.skills[i] for i, _, _ in self.fuzzy.scan(doc))
+        return found
+
+    def doc_skill_ids(self, doc):
+        """
+        Set of skill ids in a TokenizedDoc (no rescan of the text).
+        """
+        return set(self.matcher.count_ids(doc))
+
+    def doc_mask(self, doc):
+        """
+        Bitset of the skill ids in a TokenizedDoc.
+        """
+        out = 0
+        for skill_id in self.matcher.count_ids(doc):
+            out |= 1 << skill_id
+        return out
+
+    def extract_doc(self, doc):
+        """
+        Set of canonical skills in a TokenizedDoc.
+        """
+        return {self.skills[i] for i in self.doc_skill_ids(doc)}
+
+    def index_matches(self, text: str, fuzzy: bool = False):
+        """
+        MatchIndex of every skill hit in text (see SkillMatcher.index); with
+        fuzzy, near-miss spellings of skills not found exactly are added.
+        """
+        doc = tokenized(text or "")
+        index = self.matcher.index(doc)
+        if fuzzy:
+            exact = set(index)
+            seen = set()
+            for skill_id, start, end in self.fuzzy.scan(doc):
+                if skill_id not in exact and (skill_id, start) not in seen:
+                    seen.add((skill_id, start))
+                    index.add(skill_id, start, end)
+        return index
+
+
+def _transitive_closure(skills, index, implies):
+    """
+    closure[i] is the bitset of every skill reachable from skill i through
+    "implies" edges, i itself included. Computed once per load (cycles are
+    fine), so request-time expansion never walks the graph.
+    """
+    closure = [1 << i for i in range(len(skills))]
+    direct = [0] * len(skills)
+    for name, targets in implies.items():
+        skill_id = index.get(name)
+        if skill_id is None:
+            continue
+        for target in targets:
+            target_id = index.get(target)
+            if target_id is not None:
+                direct[skill_id] |= 1 << target_id
+    # depth-first with memoisation; an iterative stack avoids recursion limits
+    done = [False] * len(skills)
+    for root in range(len(skills)):
+        if done[root]:
+            continue
+        stack = [(root, direct[root])]
+        on_stack = {root}
+        while stack:
+            node, pending = stack[-1]
+            if pending:
+                low = pending & -pending
+                stack[-1] = (node, pending ^ low)
+                child = low.bit_length() - 1
+                if not done[child] and child not in on_stack:
+                    on_stack.add(child)
+                    stack.append((child, direct[child]))
+                continue
+            stack.pop()
+            on_stack.discard(node)
+            acc = closure[node] | direct[node]
+            bits = direct[node]
+            while bits:
+                low = bits & -bits
+                acc |= closure[low.bit_length() - 1]
+                bits ^= low
+            closure[node] = acc
+            done[node] = True
+    # a cycle leaves members that finished before the rest of the cycle
+    # short; a few fixed-point passes settle them
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(skills)):
+            acc = closure[i]
+            bits = acc & ~(1 << i)
+            while bits:
+                low = bits & -bits
+                acc |= closure[low.bit_length() - 1]
+                bits ^= low
+            if acc != closure[i]:
+                closure[i] = acc
+                changed = True
+    return tuple(closure)
+
+
+def load_taxonomy(path: str = TAXONOMY_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return Taxonomy(data.get("skills", []))
+
+
+_resource = None
+_resource_lock = threading.Lock()
+
+
+def get_taxonomy():
+    """
+    Current taxonomy snapshot. Cheap to call on every request.
+    """
+    global _resource
+    if _resource is None:
+        with _resource_lock:
+            if _resource is None:
+                _resource = ReloadingResource(TAXONOMY_PATH, load_taxonomy, TAXONOMY_POLL_SECONDS)
+    return _resource.get()
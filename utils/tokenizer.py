@@ -0,0 +1,187 @@
+# utils/tokenizer.py
+"""
+The one tokenizer shared by skill matching, keyword extraction and TF-IDF.
+
+A single regex pass over the lowercased text yields the tokens, their
+character offsets and the gaps between them, from which 1-3-grams are
+formed. Tokens are plain word runs: "Python/Django", "scikit-learn" and
+"node.js" are two tokens each, and compound skills are found as phrases
+("node js"), since a lone '/', '-' or '.' joins tokens into n-grams just as
+whitespace does. The last few documents are cached, so a request that
+scores the same resume several ways tokenizes it once.
+"""
+import os
+import re
+from array import array
+from functools import lru_cache
+from itertools import accumulate
+from operator import add
+
+# word runs; '+' and '#' are word characters ("c++", "c#")
+TOKEN_PATTERN = re.compile(r"[\w+#]+")
+# a token plus the non-word gap after it; consecutive matches tile the text,
+# so one findall gives tokens, gaps and (by summing lengths) offsets
+_TOKEN_AND_GAP = re.compile(r"(" + TOKEN_PATTERN.pattern + r")([^\w+#]*)")
+_LEADING_GAP = re.compile(r"[^\w+#]*")
+MAX_NGRAM = 3
+# a gap of just one of these joins tokens into an n-gram like whitespace
+# does ("node.js", "scikit-learn", "ci/cd"); any other punctuation breaks it
+JOINERS = frozenset("./-")
+# documents kept tokenized; only the current requests' resume and JD need
+# to be (a 10-page resume with its n-grams built is ~2 MB)
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "8"))
+
+
+def lower_aligned(text: str) -> str:
+    """
+    Lowercase text without changing its length, so offsets found in the
+    result point at the same characters in the original.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # a few characters (e.g. "İ") grow when lowercased; keep those as-is
+    return "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+
+
+class TokenizedDoc:
+    """
+    tokens: lowercased tokens in text order
+    starts/ends: parallel uint32 character offsets into the original text
+    gaps: the text between each token and the next
+    text: the lowercased text (same length as the original)
+    Tokens only join into an n-gram across whitespace or a single joiner
+    ('.', '-', '/'), never other punctuation.
+    """
+
+    __slots__ = ("text", "tokens", "starts", "ends", "gaps", "_ngrams", "_positions")
+
+    def __init__(self, text, tokens, starts, ends, gaps):
+        self.text = text
+        self.tokens = tokens
+        self.starts = starts
+        self.ends = ends
+        self.gaps = gaps
+        self._ngrams = None
+        self._positions = None
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def gram(self, i: int, n: int):
+        """
+        The n-gram starting at token i, or None if it would run past the
+        end or across punctuation.
+        """
+        if i + n > len(self.tokens):
+            return None
+        gaps = self.gaps
+        for k in range(i, i + n - 1):
+            if not joins(gaps[k]):
+                return None
+        return " ".join(self.tokens[i:i + n])
+
+    @property
+    def ngrams(self):
+        """
+        frozenset of every 1..MAX_NGRAM-gram (space-joined), built on first use.
+        """
+        if self._ngrams is None:
+            grams = set(self.tokens)
+            tokens, gaps = self.tokens, self.gaps
+            run = 1
+            for i in range(1, len(tokens)):
+                run = run + 1 if joins(gaps[i - 1]) else 1
+                for n in range(2, min(run, MAX_NGRAM) + 1):
+                    grams.add(" ".join(tokens[i - n + 1:i + 1]))
+            self._ngrams = frozenset(grams)
+        return self._ngrams
+
+    @property
+    def positions(self):
+        """
+        {token: [token indices]}, built on first use.
+        """
+        if self._positions is None:
+            positions = {}
+            for i, token in enumerate(self.tokens):
+                positions.setdefault(token, []).append(i)
+            self._positions = positions
+        return self._positions
+
+    def has_phrase(self, phrase: str) -> bool:
+        """
+        True if phrase occurs as whole tokens (joined by whitespace or a
+        joiner), e.g. "go" is in "go and rust" but not in "google". phrase must be
+        tokenized already: its tokens joined by single spaces.
+        """
+        if phrase.count(" ") < MAX_NGRAM:
+            return phrase in self.ngrams
+        words = phrase.split(" ")
+        if " ".join(words[:MAX_NGRAM]) not in self.ngrams:
+            return False
+        n = len(words)
+        return any(self.gram(i, n) == phrase for i in self.positions[words[0]])
+
+
+def joins(gap: str) -> bool:
+    """
+    True if tokens separated by gap belong to one n-gram.
+    """
+    return gap.isspace() or gap in JOINERS
+
+
+def tokenize(text: str) -> TokenizedDoc:
+    """
+    Tokenize text in one pass (uncached; see tokenized()).
+    """
+    lowered = lower_aligned(text or "")
+    lead = _LEADING_GAP.match(lowered).end()
+    pairs = _TOKEN_AND_GAP.findall(lowered, lead)
+    if not pairs:
+        return TokenizedDoc(lowered, (), array("I"), array("I"), ())
+    tokens, gaps = zip(*pairs)
+    token_lens = list(map(len, tokens))
+    starts = array("I", accumulate(map(add, token_lens, map(len, gaps)), initial=lead))
+    starts.pop()
+    ends = array("I", map(add, starts, token_lens))
+    return TokenizedDoc(lowered, tokens, starts, ends, gaps)
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def tokenized(text: str) -> TokenizedDoc:
+    """
+    Cached tokenize(); the same document object is handed to every consumer.
+    """
+    return tokenize(text)
+
+
+def phrase_key(text: str) -> str:
+    """
+    text as a phrase for TokenizedDoc.has_phrase: its tokens joined by
+    single spaces ("Machine  Learning" -> "machine learning").
+    """
+    return " ".join(tokenize(text).tokens)
+
+
+def is_numeric(token: str) -> bool:
+    """
+    True for tokens with no letters ("2019", "3.5", "10-12").
+    """
+    return not any(ch.isalpha() for ch in token)
+
+
+def analyze(text: str):
+    """
+    Analyzer for scikit-learn vectorizers (TfidfVectorizer(analyzer=analyze)),
+    so TF-IDF sees exactly the tokens everything else sees.
+    """
+    return tokenized(text or "").tokens
+
+
+def analyze_uncached(text: str):
+    """
+    Same tokens as analyze() without touching the document cache; for
+    fitting on whole catalogs, where caching would only evict resumes.
+    """
+    return tokenize(text or "").tokens
@@ -0,0 +1,73 @@
+# utils/vocab.py
+"""
+Integer-id vocabularies for keyword/skill presence.
+
+Job keywords are stored as int32 ids into one interned vocabulary, so a
+keyword is checked against a resume once per distinct term, however many
+jobs list it.
+"""
+import numpy as np
+
+from utils.columnar import ColumnarJobs
+from utils.tokenizer import phrase_key
+
+
+class Vocabulary:
+    """
+    Interns terms to dense integer ids (0, 1, 2, ...) in first-seen order.
+    """
+
+    def __init__(self, terms=()):
+        self._ids = {}
+        self.terms = []
+        for term in terms:
+            self.add(term)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return term in self._ids
+
+    def add(self, term: str) -> int:
+        term_id = self._ids.get(term)
+        if term_id is None:
+            term_id = self._ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def get(self, term: str, default=None):
+        return self._ids.get(term, default)
+
+
+class JobKeywords:
+    """
+    Every job's keywords as ids into one shared keyword vocabulary
+    (lowercased), CSR: term_ids[offsets[j]:offsets[j + 1]] in the job's
+    original order. Four bytes per keyword, however large the vocabulary.
+    phrases[t] is keyword t as TokenizedDoc.has_phrase expects it.
+    """
+
+    def __init__(self, jobs):
+        self.vocab = Vocabulary()
+        if isinstance(jobs, ColumnarJobs):
+            # already interned: map the catalog vocabulary, not every keyword
+            lowered = np.fromiter((self.vocab.add(t.lower()) for t in jobs.vocab), dtype=np.int32, count=len(jobs.vocab))
+            self.term_ids = lowered[jobs.keyword_ids]
+            self.offsets = np.asarray(jobs.keyword_offsets, dtype=np.int64)
+        else:
+            term_ids = []
+            offsets = [0]
+            for job in jobs:
+                for keyword in job.get("keywords", []):
+                    term_ids.append(self.vocab.add(keyword.lower()))
+                offsets.append(len(term_ids))
+            self.term_ids = np.asarray(term_ids, dtype=np.int32)
+            self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.phrases = [phrase_key(term) for term in self.vocab.terms]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def job_term_ids(self, job: int):
+        return self.term_ids[self.offsets[job]:self.offsets[job + 1]]